@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import argparse
 import json
 import os
+import sys
 from encoder import AlchemyRecipeEncoder, RewardGridEncoder
-from decoder import AlchemyRecipeDecoder, RewardGridDecoder
+from decoder import AlchemyRecipeDecoder, RecipeView, RewardGridDecoder
+from corpus import DEFAULT_MATERIALS_DIR, load_recipes
+from search import RecipeSearchIndex
+from grid_editor import GridDialog
+from grid_preview import GridPreviewCache
+from profiler import PROFILER, profiled
 
 # 定义元素属性选项
 ELEMENT_PROPERTIES = [
@@ -13,6 +20,22 @@ ELEMENT_PROPERTIES = [
     "雷系"
 ]
 
+# 搜索输入防抖延迟（毫秒）
+SEARCH_DEBOUNCE_MS = 150
+# 每批显示的搜索结果数量
+SEARCH_BATCH_SIZE = 50
+
+# 状态栏性能统计的刷新间隔（毫秒）
+STATUS_REFRESH_MS = 1000
+
+# 搜索匹配字段的显示名称
+SEARCH_FIELD_NAMES = {
+    "name": "名称",
+    "tags": "标签",
+    "id": "ID",
+    "materials": "材料"
+}
+
 class AlchemyRecipeApp:
     def __init__(self, root):
         self.root = root
@@ -28,6 +51,16 @@ class AlchemyRecipeApp:
         scaled_height = int(base_height * self.dpi_scale)
         self.root.geometry(f"{scaled_width}x{scaled_height}")
         
+        # 状态栏（启用性能统计时显示耗时摘要）
+        self.status_bar = ttk.Label(root, text="", anchor='w')
+        self.status_bar.pack(side='bottom', fill='x', padx=10)
+        
+        # 配置字体大小（在创建组件之前，组件创建时直接使用缩放后的字体）
+        self.style = None
+        self.decoder_ready = False
+        self.search_ready = False
+        self.configure_fonts()
+        
         # 创建标签页
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -36,10 +69,16 @@ class AlchemyRecipeApp:
         self.encoder_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.encoder_frame, text="编码器")
         
-        # 创建解码器标签页
+        # 创建解码器标签页（界面在首次切换到该标签页时创建）
         self.decoder_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.decoder_frame, text="解码器")
         
+        # 创建搜索标签页（界面和索引在首次切换到该标签页时创建）
+        self.search_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.search_frame, text="搜索")
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
         # 初始化编码器和解码器
         self.recipe_encoder = AlchemyRecipeEncoder()
         self.recipe_decoder = AlchemyRecipeDecoder()
@@ -50,34 +89,72 @@ class AlchemyRecipeApp:
         self.materials_list = []
         self.base_elements_list = []
         
-        # 设置编码器界面
-        self.setup_encoder_ui()
+        # 网格输入对话框（首次使用时创建）
+        self.base_element_dialog = None
+        self.reward_dialog = None
         
-        # 设置解码器界面
-        self.setup_decoder_ui()
+        # 网格预览图缓存（编码器和解码器共用）
+        self.grid_previews = GridPreviewCache(self.root, self.grid_decoder, cell_size=int(8 * self.dpi_scale))
+        # 解码结果中正在显示的预览图，防止被缓存淘汰后回收
+        self.result_images = []
         
-        # 配置字体大小
-        self.configure_fonts()
+        # 搜索状态；索引在首次打开搜索标签页时建立，在此之前保存的配方先暂存
+        self.search_index = None
+        self.pending_search_recipes = []
+        self.search_after_id = None
+        self.search_generation = 0
+        self.search_results = []
+        
+        # 只设置编码器界面，其余标签页按需创建
+        self.setup_encoder_ui()
+        
+        if PROFILER.enabled:
+            self.refresh_status_bar()
+    
+    def refresh_status_bar(self):
+        self.status_bar.configure(text="性能统计: " + (PROFILER.summary() or "暂无数据"))
+        self.root.after(STATUS_REFRESH_MS, self.refresh_status_bar)
     
     def configure_fonts(self):
         # 根据DPI缩放调整字体大小
         base_size = 9
         scaled_size = int(base_size * self.dpi_scale)
         
-        # 创建自定义样式
-        style = ttk.Style()
-        style.configure('.', font=('TkDefaultFont', scaled_size))
-        style.configure('Treeview', font=('TkDefaultFont', scaled_size))
-        style.configure('TLabel', font=('TkDefaultFont', scaled_size))
-        style.configure('TButton', font=('TkDefaultFont', scaled_size))
-        style.configure('TEntry', font=('TkDefaultFont', scaled_size))
-        
-        # 配置Text组件的字体
-        text_font = ('TkDefaultFont', scaled_size)
-        if hasattr(self, 'json_text'):
-            self.json_text.configure(font=text_font)
-        if hasattr(self, 'result_text'):
-            self.result_text.configure(font=text_font)
+        self.text_font = ('TkDefaultFont', scaled_size)
+        
+        # 样式对象只创建一次，之后重复使用
+        if self.style is None:
+            self.style = ttk.Style(self.root)
+        for style_name in ('.', 'Treeview', 'TLabel', 'TButton', 'TEntry'):
+            self.style.configure(style_name, font=self.text_font)
+        
+        # 配置已创建的组件的字体，之后创建的组件直接使用self.text_font
+        if self.decoder_ready:
+            self.json_text.configure(font=self.text_font)
+            self.result_text.configure(font=self.text_font)
+        if self.search_ready:
+            self.search_listbox.configure(font=self.text_font)
+    
+    def on_tab_changed(self, event):
+        selected = self.notebook.select()
+        if selected == str(self.decoder_frame):
+            self.ensure_decoder_ui()
+        elif selected == str(self.search_frame):
+            self.ensure_search_ui()
+    
+    def ensure_decoder_ui(self):
+        # 解码器界面只在第一次使用时创建
+        if not self.decoder_ready:
+            with PROFILER.timed("gui.setup_decoder"):
+                self.setup_decoder_ui()
+            self.decoder_ready = True
+    
+    def ensure_search_ui(self):
+        # 搜索界面和默认目录的索引只在第一次使用时创建
+        if not self.search_ready:
+            with PROFILER.timed("gui.setup_search"):
+                self.setup_search_ui()
+            self.search_ready = True
     
     def setup_encoder_ui(self):
         # 创建基本信息框架
@@ -157,6 +234,10 @@ class AlchemyRecipeApp:
         ttk.Button(buttons_frame, text="生成JSON", command=self.generate_json).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="保存到文件", command=self.save_json).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="清除所有", command=self.clear_encoder).pack(side='left', padx=5)
+        
+        # 紧凑格式（网格编码写成整数，奖励按列存储）
+        self.compact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(buttons_frame, text="紧凑格式", variable=self.compact_var).pack(side='left', padx=5)
     
     def add_material(self):
         material_type = self.material_type.get()
@@ -177,6 +258,7 @@ class AlchemyRecipeApp:
         # 清除输入
         self.material_id_entry.delete(0, 'end')
     
+    @profiled("gui.update_materials_display")
     def update_materials_display(self):
         # 清除现有显示
         for widget in self.materials_display.winfo_children():
@@ -200,105 +282,30 @@ class AlchemyRecipeApp:
         self.update_materials_display()
     
     def add_base_element(self):
-        # 创建基本炼金成分对话框
-        element_dialog = tk.Toplevel(self.root)
-        element_dialog.title("添加基本炼金成分")
-        
-        # 根据DPI缩放调整对话框大小
-        dialog_width = int(400 * self.dpi_scale)
-        dialog_height = int(400 * self.dpi_scale)
-        element_dialog.geometry(f"{dialog_width}x{dialog_height}")
-        
-        element_dialog.transient(self.root)
-        element_dialog.grab_set()
-        
-        # 3x3网格
-        ttk.Label(element_dialog, text="3x3网格:").grid(row=0, column=0, columnspan=2, sticky='w', padx=5, pady=5)
-        
-        grid_frame = ttk.Frame(element_dialog)
-        grid_frame.grid(row=1, column=0, columnspan=2, padx=5, pady=5)
-        
-        # 创建3x3网格
-        self.grid_buttons = []
-        button_size = int(5 * self.dpi_scale)
-        for i in range(3):
-            row_buttons = []
-            for j in range(3):
-                btn = ttk.Button(grid_frame, text=" ", width=button_size)
-                btn.grid(row=i, column=j, padx=2, pady=2)
-                btn.state = 0
-                
-                def create_click_handler(button):
-                    def on_click():
-                        button.state = (button.state + 1) % 3
-                        if button.state == 0:
-                            button.configure(text=" ")
-                        elif button.state == 1:
-                            button.configure(text="○")
-                        else:
-                            button.configure(text="★")
-                    return on_click
-                
-                btn.configure(command=create_click_handler(btn))
-                row_buttons.append(btn)
-            self.grid_buttons.append(row_buttons)
-        
-        # 元素属性选择（必选）
-        ttk.Label(element_dialog, text="元素:").grid(row=2, column=0, sticky='w', padx=5, pady=5)
-        element_var = tk.StringVar()
-        element_combo = ttk.Combobox(element_dialog, textvariable=element_var, values=ELEMENT_PROPERTIES, state='readonly')
-        element_combo.grid(row=2, column=1, sticky='ew', padx=5, pady=5)
-        if ELEMENT_PROPERTIES:
-            element_combo.set(ELEMENT_PROPERTIES[0])
-        
-        # 确认按钮
-        def confirm_element():
-            element = element_var.get()
-            
-            if not element:
-                messagebox.showwarning("警告", "请选择元素")
-                return
-            
-            # 获取网格状态
-            grid_state = []
-            has_non_empty = False
-            for row in self.grid_buttons:
-                for btn in row:
-                    grid_state.append(btn.state)
-                    if btn.state != 0:
-                        has_non_empty = True
-            
-            if not has_non_empty:
-                messagebox.showwarning("警告", "网格中必须至少有一个非空白格子")
-                return
-            
-            # 编码网格
-            grid_id = self.grid_encoder.encode(grid_state, element)
-            
-            # 添加到基本炼金成分列表
-            element_data = {
-                "id": grid_id
-            }
-            self.base_elements_list.append(element_data)
-            
-            # 更新显示
-            self.update_base_elements_display()
-            
-            element_dialog.destroy()
-        
-        ttk.Button(element_dialog, text="确认", command=confirm_element).grid(row=3, column=0, columnspan=2, pady=10)
+        # 对话框只创建一次，之后重复使用
+        if self.base_element_dialog is None:
+            self.base_element_dialog = GridDialog(
+                self.root, "添加基本炼金成分", self.dpi_scale, self.grid_encoder, self.grid_decoder,
+                ELEMENT_PROPERTIES, self.append_base_elements
+            )
+        self.base_element_dialog.show()
+    
+    def append_base_elements(self, entries):
+        self.base_elements_list.extend(entries)
+        self.update_base_elements_display()
     
+    @profiled("gui.update_base_elements_display")
     def update_base_elements_display(self):
         # 清除现有显示
         for widget in self.base_elements_display.winfo_children():
             widget.destroy()
         
         # 显示基本炼金成分列表
-        for i, element in enumerate(self.base_elements_list):
+        for i, element_data in enumerate(self.base_elements_list):
             frame = ttk.Frame(self.base_elements_display)
             frame.pack(fill='x', pady=2)
             
-            grid_state, color = self.grid_decoder.decode(element['id'])
+            grid_state, color = self.grid_decoder.decode(element_data['id'])
             display_text = f"成分 {i+1}: "
             if color:
                 element_map = {
@@ -310,6 +317,10 @@ class AlchemyRecipeApp:
                 element = element_map.get(color, color)
                 display_text += f"元素: {element}"
             
+            preview = self.grid_previews.get(element_data['id'])
+            preview_label = ttk.Label(frame, image=preview)
+            preview_label.image = preview
+            preview_label.pack(side='left', padx=(0, 5))
             ttk.Label(frame, text=display_text).pack(side='left')
             
             # 删除按钮
@@ -323,119 +334,19 @@ class AlchemyRecipeApp:
         self.update_base_elements_display()
     
     def add_reward(self):
-        # 创建奖励对话框
-        reward_dialog = tk.Toplevel(self.root)
-        reward_dialog.title("添加奖励")
-        
-        # 根据DPI缩放调整对话框大小
-        dialog_width = int(400 * self.dpi_scale)
-        dialog_height = int(500 * self.dpi_scale)
-        reward_dialog.geometry(f"{dialog_width}x{dialog_height}")
-        
-        reward_dialog.transient(self.root)
-        reward_dialog.grab_set()
-        
-        # 奖励等级
-        ttk.Label(reward_dialog, text="等级:").grid(row=0, column=0, sticky='w', padx=5, pady=5)
-        level_entry = ttk.Entry(reward_dialog)
-        level_entry.grid(row=0, column=1, sticky='ew', padx=5, pady=5)
-        
-        # 奖励属性（下拉菜单）
-        ttk.Label(reward_dialog, text="解锁所需属性:").grid(row=1, column=0, sticky='w', padx=5, pady=5)
-        property_var = tk.StringVar()
-        property_combo = ttk.Combobox(reward_dialog, textvariable=property_var, values=ELEMENT_PROPERTIES, state='readonly')
-        property_combo.grid(row=1, column=1, sticky='ew', padx=5, pady=5)
-        if ELEMENT_PROPERTIES:
-            property_combo.set(ELEMENT_PROPERTIES[0])
-        
-        # 奖励ID (3x3网格)
-        ttk.Label(reward_dialog, text="奖励ID (3x3网格):").grid(row=2, column=0, columnspan=2, sticky='w', padx=5, pady=5)
-        
-        grid_frame = ttk.Frame(reward_dialog)
-        grid_frame.grid(row=3, column=0, columnspan=2, padx=5, pady=5)
-        
-        # 创建3x3网格
-        self.grid_buttons = []
-        button_size = int(5 * self.dpi_scale)  # 调整按钮大小
-        for i in range(3):
-            row_buttons = []
-            for j in range(3):
-                btn = ttk.Button(grid_frame, text=" ", width=button_size)
-                btn.grid(row=i, column=j, padx=2, pady=2)
-                btn.state = 0  # 0: 空白, 1: 圈, 2: 星
-                
-                # 使用闭包来捕获按钮索引
-                def create_click_handler(button):
-                    def on_click():
-                        button.state = (button.state + 1) % 3
-                        if button.state == 0:
-                            button.configure(text=" ")
-                        elif button.state == 1:
-                            button.configure(text="○")
-                        else:
-                            button.configure(text="★")
-                    return on_click
-                
-                btn.configure(command=create_click_handler(btn))
-                row_buttons.append(btn)
-            self.grid_buttons.append(row_buttons)
-        
-        # 网格元素属性选择（必选）
-        ttk.Label(reward_dialog, text="非空白格子元素:").grid(row=4, column=0, sticky='w', padx=5, pady=5)
-        element_var = tk.StringVar()
-        element_combo = ttk.Combobox(reward_dialog, textvariable=element_var, values=ELEMENT_PROPERTIES, state='readonly')
-        element_combo.grid(row=4, column=1, sticky='ew', padx=5, pady=5)
-        if ELEMENT_PROPERTIES:
-            element_combo.set(ELEMENT_PROPERTIES[0])
-        
-        # 确认按钮
-        def confirm_reward():
-            try:
-                level = int(level_entry.get())
-                property_name = property_var.get()
-                element = element_var.get()
-                
-                if not property_name:
-                    messagebox.showwarning("警告", "请选择奖励属性")
-                    return
-                
-                if not element:
-                    messagebox.showwarning("警告", "请选择元素")
-                    return
-                
-                # 获取网格状态
-                grid_state = []
-                has_non_empty = False
-                for row in self.grid_buttons:
-                    for btn in row:
-                        grid_state.append(btn.state)
-                        if btn.state != 0:
-                            has_non_empty = True
-                
-                if not has_non_empty:
-                    messagebox.showwarning("警告", "网格中必须至少有一个非空白格子")
-                    return
-                
-                # 编码网格
-                grid_id = self.grid_encoder.encode(grid_state, element)
-                
-                # 添加到奖励列表
-                reward = {
-                    "level": level,
-                    "property": property_name,
-                    "id": grid_id
-                }
-                self.rewards_list.append(reward)
-                
-                # 更新显示
-                self.update_rewards_display()
-                
-                reward_dialog.destroy()
-            except ValueError:
-                messagebox.showerror("错误", "等级必须是数字")
-        
-        ttk.Button(reward_dialog, text="确认", command=confirm_reward).grid(row=5, column=0, columnspan=2, pady=10)
+        # 对话框只创建一次，之后重复使用
+        if self.reward_dialog is None:
+            self.reward_dialog = GridDialog(
+                self.root, "添加奖励", self.dpi_scale, self.grid_encoder, self.grid_decoder,
+                ELEMENT_PROPERTIES, self.append_rewards, with_reward_fields=True
+            )
+        self.reward_dialog.show()
+    
+    def append_rewards(self, entries):
+        self.rewards_list.extend(entries)
+        self.update_rewards_display()
     
+    @profiled("gui.update_rewards_display")
     def update_rewards_display(self):
         # 清除现有显示
         for widget in self.rewards_display.winfo_children():
@@ -446,6 +357,10 @@ class AlchemyRecipeApp:
             frame = ttk.Frame(self.rewards_display)
             frame.pack(fill='x', pady=2)
             
+            preview = self.grid_previews.get(reward['id'])
+            preview_label = ttk.Label(frame, image=preview)
+            preview_label.image = preview
+            preview_label.pack(side='left', padx=(0, 5))
             ttk.Label(frame, text=f"奖励 {i+1}: 等级 {reward['level']}, 解锁所需属性: {reward['property']}").pack(side='left')
             
             # 删除按钮
@@ -477,7 +392,7 @@ class AlchemyRecipeApp:
             }
             
             # 编码为JSON
-            json_data = self.recipe_encoder.encode(recipe_data)
+            json_data = self.recipe_encoder.encode(recipe_data, compact=self.compact_var.get())
             
             # 显示JSON
             json_dialog = tk.Toplevel(self.root)
@@ -488,7 +403,7 @@ class AlchemyRecipeApp:
             dialog_height = int(400 * self.dpi_scale)
             json_dialog.geometry(f"{dialog_width}x{dialog_height}")
             
-            text_area = tk.Text(json_dialog, wrap='word', font=('TkDefaultFont', int(9 * self.dpi_scale)))
+            text_area = tk.Text(json_dialog, wrap='word', font=self.text_font)
             text_area.pack(fill='both', expand=True, padx=10, pady=10)
             text_area.insert('1.0', json_data)
             
@@ -513,8 +428,15 @@ class AlchemyRecipeApp:
                 filetypes=[("JSON文件", "*.json"), ("所有文件", "*.*")]
             )
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
+                with PROFILER.timed("file.write"), open(file_path, 'w', encoding='utf-8') as f:
                     f.write(json_data)
+                # 就地更新搜索索引；搜索标签页尚未打开时，等索引建立后再加入
+                recipe_data = self.recipe_decoder.decode(json_data)
+                if self.search_ready:
+                    self.search_index.add(recipe_data)
+                    self.refresh_search()
+                else:
+                    self.pending_search_recipes.append(recipe_data)
                 messagebox.showinfo("成功", f"JSON已保存到 {file_path}")
     
     def clear_encoder(self):
@@ -543,14 +465,14 @@ class AlchemyRecipeApp:
         json_frame = ttk.LabelFrame(self.decoder_frame, text="JSON输入")
         json_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
-        self.json_text = tk.Text(json_frame, wrap='word', height=10, font=('TkDefaultFont', int(9 * self.dpi_scale)))
+        self.json_text = tk.Text(json_frame, wrap='word', height=10, font=self.text_font)
         self.json_text.pack(fill='both', expand=True, padx=5, pady=5)
         
         # 解析结果区域
         result_frame = ttk.LabelFrame(self.decoder_frame, text="解析结果")
         result_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
-        self.result_text = tk.Text(result_frame, wrap='word', height=10, state='disabled', font=('TkDefaultFont', int(9 * self.dpi_scale)))
+        self.result_text = tk.Text(result_frame, wrap='word', height=10, state='disabled', font=self.text_font)
         self.result_text.pack(fill='both', expand=True, padx=5, pady=5)
     
     def load_json_file(self):
@@ -559,13 +481,14 @@ class AlchemyRecipeApp:
         )
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
+                with PROFILER.timed("file.read"), open(file_path, 'r', encoding='utf-8') as f:
                     json_content = f.read()
                 self.json_text.delete('1.0', 'end')
                 self.json_text.insert('1.0', json_content)
             except Exception as e:
                 messagebox.showerror("错误", f"无法加载文件: {str(e)}")
     
+    @profiled("gui.parse_json")
     def parse_json(self):
         try:
             json_content = self.json_text.get('1.0', 'end').strip()
@@ -579,6 +502,7 @@ class AlchemyRecipeApp:
             # 显示解析结果
             self.result_text.config(state='normal')
             self.result_text.delete('1.0', 'end')
+            self.result_images = []
             
             # 格式化显示
             result = f"ID: {recipe_data['id']}\n"
@@ -591,76 +515,159 @@ class AlchemyRecipeApp:
             result += "\n"
             
             result += "基本炼金成分:\n"
+            self.result_text.insert('end', result)
             for i, element in enumerate(recipe_data.get('base_elements', [])):
-                result += f"  成分 {i+1}:\n"
-                grid_state, color = self.grid_decoder.decode(element['id'])
-                grid_text = "    网格:\n"
-                
-                for row in range(3):
-                    grid_text += "      "
-                    for col in range(3):
-                        idx = row * 3 + col
-                        if grid_state[idx] == 0:
-                            grid_text += "□ "
-                        elif grid_state[idx] == 1:
-                            grid_text += "○ "
-                        else:
-                            grid_text += "★ "
-                    grid_text += "\n"
-                
-                if color:
-                    element_map = {
-                        "R": "火系",
-                        "B": "水系",
-                        "G": "草系",
-                        "Y": "雷系"
-                    }
-                    element = element_map.get(color, color)
-                    grid_text += f"    元素: {element}\n"
-                
-                result += grid_text + "\n"
+                self.result_text.insert('end', f"  成分 {i+1}:  ")
+                color = self.insert_grid_preview(element['id'])
+                self.result_text.insert('end', f"  元素: {color}\n")
             
-            result += "奖励:\n"
+            self.result_text.insert('end', "\n奖励:\n")
             for i, reward in enumerate(recipe_data['rewards']):
-                result += f"  奖励 {i+1}:\n"
-                result += f"    等级: {reward['level']}\n"
-                result += f"    解锁所需属性: {reward['property']}\n"
-                
-                # 解码网格
-                grid_state, color = self.grid_decoder.decode(reward['id'])
-                grid_text = "    网格:\n"
-                
-                for row in range(3):
-                    grid_text += "      "
-                    for col in range(3):
-                        idx = row * 3 + col
-                        if grid_state[idx] == 0:
-                            grid_text += "□ "
-                        elif grid_state[idx] == 1:
-                            grid_text += "○ "
-                        else:
-                            grid_text += "★ "
-                    grid_text += "\n"
-                
-                if color:
-                    element_map = {
-                        "R": "火系",
-                        "B": "水系",
-                        "G": "草系",
-                        "Y": "雷系"
-                    }
-                    element = element_map.get(color, color)
-                    grid_text += f"    非空白格子元素: {element}\n"
-                
-                result += grid_text + "\n"
+                self.result_text.insert('end', f"  奖励 {i+1}:  ")
+                color = self.insert_grid_preview(reward['id'])
+                self.result_text.insert('end', f"  等级: {reward['level']}, 解锁所需属性: {reward['property']}, 非空白格子元素: {color}\n")
             
-            self.result_text.insert('1.0', result)
             self.result_text.config(state='disabled')
             
         except Exception as e:
             messagebox.showerror("错误", f"解析JSON失败: {str(e)}")
 
+    def setup_search_ui(self):
+        # 搜索索引
+        self.search_index = RecipeSearchIndex()
+        
+        # 搜索输入框架
+        control_frame = ttk.Frame(self.search_frame)
+        control_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(control_frame, text="搜索 (名称/标签/材料ID/ID):").pack(side='left', padx=5)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(control_frame, textvariable=self.search_var)
+        self.search_entry.pack(side='left', fill='x', expand=True, padx=5)
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+        
+        ttk.Button(control_frame, text="加载配方目录", command=self.load_search_directory).pack(side='left', padx=5)
+        
+        # 搜索结果区域
+        result_frame = ttk.LabelFrame(self.search_frame, text="搜索结果")
+        result_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        self.search_listbox = tk.Listbox(result_frame, font=self.text_font)
+        self.search_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        scrollbar = ttk.Scrollbar(result_frame, orient='vertical', command=self.search_listbox.yview)
+        scrollbar.pack(side='right', fill='y')
+        self.search_listbox.configure(yscrollcommand=scrollbar.set)
+        self.search_listbox.bind('<Double-Button-1>', lambda event: self.open_search_result())
+        
+        self.search_status = ttk.Label(self.search_frame, text="")
+        self.search_status.pack(fill='x', padx=10, pady=5)
+        
+        # 默认加载Helpers/materials目录
+        if os.path.isdir(DEFAULT_MATERIALS_DIR):
+            self.index_directory(DEFAULT_MATERIALS_DIR)
+        
+        # 打开搜索标签页之前保存的配方，覆盖目录中的旧版本
+        if self.pending_search_recipes:
+            for recipe_data in self.pending_search_recipes:
+                self.search_index.add(recipe_data)
+            self.pending_search_recipes = []
+            self.search_status.configure(text=f"已索引 {len(self.search_index)} 个配方")
+    
+    def index_directory(self, directory):
+        try:
+            # 搜索只用到名称、标签和ID，不需要解码网格
+            recipes = load_recipes(directory, self.recipe_decoder, lazy=True)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("错误", f"无法加载配方目录: {str(e)}")
+            return
+        
+        for recipe_data in recipes.values():
+            self.search_index.add(recipe_data)
+        self.search_status.configure(text=f"已索引 {len(self.search_index)} 个配方")
+        self.refresh_search()
+    
+    def load_search_directory(self):
+        directory = filedialog.askdirectory()
+        if directory:
+            self.index_directory(directory)
+    
+    def schedule_search(self):
+        # 防抖：只在停止输入一段时间后执行搜索
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.refresh_search)
+    
+    def refresh_search(self):
+        self.search_after_id = None
+        # 新的搜索会使尚未显示完的旧结果失效
+        self.search_generation += 1
+        self.search_listbox.delete(0, 'end')
+        self.search_results = []
+        
+        query = self.search_var.get()
+        if not query.strip():
+            return
+        
+        results = self.search_index.search(query)
+        self.show_search_batch(results, self.search_generation)
+    
+    def show_search_batch(self, results, generation):
+        if generation != self.search_generation:
+            return
+        
+        # 分批显示结果，避免阻塞界面
+        for _ in range(SEARCH_BATCH_SIZE):
+            try:
+                recipe_data, field = next(results)
+            except StopIteration:
+                self.search_status.configure(text=f"找到 {len(self.search_results)} 个配方")
+                return
+            self.search_results.append(recipe_data)
+            tags = ', '.join(recipe_data['tags'])
+            self.search_listbox.insert('end', f"[{recipe_data['id']}] {recipe_data['name']} ({tags}) - 匹配{SEARCH_FIELD_NAMES[field]}")
+        
+        self.search_status.configure(text=f"已找到 {len(self.search_results)} 个配方...")
+        self.root.after(1, lambda: self.show_search_batch(results, generation))
+    
+    def open_search_result(self):
+        selection = self.search_listbox.curselection()
+        if not selection:
+            return
+        
+        recipe_data = self.search_results[selection[0]]
+        if isinstance(recipe_data, RecipeView):
+            recipe_data = recipe_data.to_dict()
+        json_content = json.dumps(recipe_data, ensure_ascii=False, indent=2)
+        self.ensure_decoder_ui()
+        self.json_text.delete('1.0', 'end')
+        self.json_text.insert('1.0', json_content)
+        self.notebook.select(self.decoder_frame)
+        self.parse_json()
+
+    def insert_grid_preview(self, grid_id):
+        # 在解析结果中插入网格预览图，返回网格的元素属性
+        preview, color = self.grid_previews.lookup(grid_id)
+        self.result_images.append(preview)
+        self.result_text.image_create('end', image=preview, padx=2, pady=2)
+        return color
+    
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="炼金配方JSON生成器")
+    parser.add_argument('--profile', action='store_true', help="启用性能统计并在状态栏显示")
+    parser.add_argument('--stats-json', metavar='FILE', help="退出时将性能统计保存为JSON文件")
+    args = parser.parse_args()
+    if args.profile or args.stats_json:
+        PROFILER.enable()
+    
     root = tk.Tk()
     app = AlchemyRecipeApp(root)
-    root.mainloop() 
\ No newline at end of file
+    root.mainloop()
+    
+    if PROFILER.enabled:
+        print(PROFILER.report())
+        if args.stats_json:
+            try:
+                PROFILER.dump_json(args.stats_json)
+            except OSError as e:
+                print(f"无法保存性能统计: {str(e)}", file=sys.stderr)
+                sys.exit(1) 
\ No newline at end of file
@@ -0,0 +1,106 @@
+import time
+
+# 尽早记录进程启动时间，导入耗时也计入首帧时间
+_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# 默认运行次数
+DEFAULT_RUNS = 10
+
+
+def measure_once():
+    """
+    在当前进程中启动一次生成器，测量到第一帧绘制完成的时间
+
+    返回:
+        {"import": 导入耗时, "construct": 创建界面耗时, "first_frame": 首帧时间}，单位毫秒
+    """
+    import tkinter as tk
+    from app import AlchemyRecipeApp
+    imported = time.perf_counter()
+
+    root = tk.Tk()
+    AlchemyRecipeApp(root)
+    constructed = time.perf_counter()
+
+    timings = {}
+
+    def on_first_frame():
+        if not timings:
+            timings["first_frame"] = (time.perf_counter() - _START) * 1000
+            root.destroy()
+
+    def on_map(event):
+        # 子组件的<Map>事件也会传到主窗口的绑定上，只处理主窗口本身
+        if event.widget is root:
+            root.after_idle(on_first_frame)
+
+    # 窗口映射后，空闲回调在第一次重绘完成之后执行
+    root.bind('<Map>', on_map)
+    root.mainloop()
+
+    timings["import"] = (imported - _START) * 1000
+    timings["construct"] = (constructed - imported) * 1000
+    return timings
+
+
+def run_benchmark(runs=DEFAULT_RUNS):
+    """
+    在独立的子进程中多次启动生成器，每次都包括解释器启动后的冷导入
+
+    返回:
+        每次运行的耗时字典列表
+    """
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def format_results(results):
+    """返回启动耗时的文本报告"""
+    lines = [f"{'阶段':<12}{'最小(ms)':>10}{'中位数(ms)':>12}{'最大(ms)':>10}"]
+    for key, label in (("import", "导入"), ("construct", "创建界面"), ("first_frame", "首帧")):
+        values = [result[key] for result in results]
+        lines.append(f"{label:<12}{min(values):>10.1f}{statistics.median(values):>12.1f}{max(values):>10.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测量炼金配方JSON生成器的启动时间（到第一帧绘制完成）")
+    parser.add_argument('-n', '--runs', type=int, default=DEFAULT_RUNS, help="运行次数")
+    parser.add_argument('--json', metavar='FILE', help="将每次运行的耗时保存为JSON文件")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return 0
+
+    try:
+        results = run_benchmark(args.runs)
+    except subprocess.CalledProcessError as e:
+        # 常见原因是没有可用的显示（DISPLAY未设置），输出子进程的最后一行错误
+        lines = e.stderr.strip().splitlines()
+        print(f"启动测试失败: {lines[-1] if lines else e}", file=sys.stderr)
+        return 1
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import os
+import sys
+from corpus import DEFAULT_MATERIALS_DIR, convert_recipe_file, iter_recipe_files, load_recipes
+from corpus_diff import diff_snapshots, summarize_changeset, write_patch
+from decoder import AlchemyRecipeDecoder
+from profiler import PROFILER
+from recipe_service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WATCH_INTERVAL, RecipeCorpusCache, RecipeService
+from unity_export import DEFAULT_SCRIPT_PATH, DEFAULT_TABLE_PATH, export_unity_table
+
+
+def collect_files(paths):
+    """展开命令行中的文件和目录参数"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(iter_recipe_files(path))
+        else:
+            files.append(path)
+    return files
+
+
+def command_validate(args):
+    decoder = AlchemyRecipeDecoder()
+    errors = 0
+    files = collect_files(args.paths)
+    for file_path in files:
+        try:
+            with PROFILER.timed("file.read"), open(file_path, 'r', encoding='utf-8') as f:
+                json_content = f.read()
+            decoder.decode(json_content)
+        except (OSError, ValueError) as e:
+            errors += 1
+            print(f"{file_path}: {str(e)}", file=sys.stderr)
+
+    print(f"已验证 {len(files)} 个配方文件，{errors} 个无效")
+    return 1 if errors else 0
+
+
+def command_convert(args):
+    files = collect_files(args.paths)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    total_before = total_after = 0
+    errors = 0
+    for file_path in files:
+        output_path = os.path.join(args.output_dir, os.path.basename(file_path)) if args.output_dir else None
+        try:
+            before, after = convert_recipe_file(file_path, compact=not args.expand, output_path=output_path)
+        except (OSError, ValueError) as e:
+            errors += 1
+            print(f"{file_path}: {str(e)}", file=sys.stderr)
+            continue
+        total_before += before
+        total_after += after
+
+    print(f"已转换 {len(files) - errors} 个配方文件，{total_before} 字节 -> {total_after} 字节")
+    return 1 if errors else 0
+
+
+def load_paths(paths):
+    """加载命令行中的配方文件和目录，返回配方数据列表"""
+    decoder = AlchemyRecipeDecoder()
+    recipes = []
+    for path in paths:
+        if os.path.isdir(path):
+            recipes.extend(load_recipes(path, decoder).values())
+            continue
+        with PROFILER.timed("file.read"), open(path, 'r', encoding='utf-8') as f:
+            json_content = f.read()
+        try:
+            recipes.append(decoder.decode(json_content))
+        except ValueError as e:
+            raise ValueError(f"{os.path.basename(path)}: {str(e)}")
+    return recipes
+
+
+def command_export_unity(args):
+    try:
+        recipes = load_paths(args.paths)
+        regenerated = export_unity_table(recipes, args.table, args.script, force=args.force)
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    if regenerated:
+        print(f"已导出 {len(recipes)} 个配方到 {args.table}")
+    else:
+        print("配方内容没有变化，跳过导出")
+    return 0
+
+
+def command_serve(args):
+    service = RecipeService(RecipeCorpusCache(args.directory), watch_interval=args.watch_interval)
+    address = args.socket or f"{args.host}:{args.port}"
+    print(f"配方服务已启动: {address}（按Ctrl+C停止）")
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_diff(args):
+    try:
+        changeset = diff_snapshots(args.old, args.new)
+        print(summarize_changeset(changeset))
+        if args.patch:
+            write_patch(changeset, args.patch)
+            print(f"补丁已保存到 {args.patch}")
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="炼金配方命令行工具")
+    parser.add_argument('--stats', '--profile', action='store_true', help="启用性能统计并在结束时输出报告")
+    parser.add_argument('--stats-json', metavar='FILE', help="结束时将性能统计保存为JSON文件（自动启用性能统计）")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    validate_parser = subparsers.add_parser('validate', help="验证配方文件")
+    validate_parser.add_argument('paths', nargs='*', default=[DEFAULT_MATERIALS_DIR], help="配方文件或目录，默认为Helpers/materials")
+    validate_parser.set_defaults(func=command_validate)
+
+    convert_parser = subparsers.add_parser('convert', help="将配方文件转换为紧凑格式（或转换回标准格式）")
+    convert_parser.add_argument('paths', nargs='+', help="配方文件或目录")
+    convert_parser.add_argument('--expand', action='store_true', help="转换为标准格式")
+    convert_parser.add_argument('-o', '--output-dir', help="输出目录，默认覆盖原文件")
+    convert_parser.set_defaults(func=command_convert)
+
+    export_parser = subparsers.add_parser('export-unity', help="导出Unity使用的二进制配方表和C#读取脚本")
+    export_parser.add_argument('paths', nargs='*', default=[DEFAULT_MATERIALS_DIR], help="配方文件或目录，默认为Helpers/materials")
+    export_parser.add_argument('--table', default=DEFAULT_TABLE_PATH, help="二进制配方表路径")
+    export_parser.add_argument('--script', default=DEFAULT_SCRIPT_PATH, help="C#脚本路径")
+    export_parser.add_argument('--force', action='store_true', help="即使配方内容没有变化也重新生成")
+    export_parser.set_defaults(func=command_export_unity)
+
+    diff_parser = subparsers.add_parser('diff', help="比较两个配方快照（目录、JSON数组文件或NDJSON文件）")
+    diff_parser.add_argument('old', help="旧快照")
+    diff_parser.add_argument('new', help="新快照")
+    diff_parser.add_argument('--patch', metavar='FILE', help="将变化的部分保存为NDJSON补丁文件")
+    diff_parser.set_defaults(func=command_diff)
+
+    serve_parser = subparsers.add_parser('serve', help="启动本地配方服务，常驻内存提供验证、解码、查询和批量获取")
+    serve_parser.add_argument('directory', nargs='?', default=DEFAULT_MATERIALS_DIR, help="配方目录，默认为Helpers/materials")
+    serve_parser.add_argument('--host', default=DEFAULT_HOST, help="监听地址")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="监听端口")
+    serve_parser.add_argument('--socket', help="使用UNIX套接字代替TCP")
+    serve_parser.add_argument('--watch-interval', type=float, default=DEFAULT_WATCH_INTERVAL, help="检查文件变化的间隔（秒），0表示不检查")
+    serve_parser.set_defaults(func=command_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.stats or args.stats_json:
+        PROFILER.enable()
+
+    exit_code = args.func(args)
+
+    # 通过参数或环境变量UALCHEMIA_PROFILE启用统计时都输出报告
+    if PROFILER.enabled:
+        print(PROFILER.report(), file=sys.stderr)
+    if args.stats_json:
+        try:
+            PROFILER.dump_json(args.stats_json)
+        except OSError as e:
+            print(f"无法保存性能统计: {str(e)}", file=sys.stderr)
+            return 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import os
+from decoder import AlchemyRecipeDecoder
+from encoder import AlchemyRecipeEncoder
+from profiler import PROFILER
+
+# 默认配方目录（Helpers/materials）
+DEFAULT_MATERIALS_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'materials')
+)
+
+
+def iter_recipe_files(directory=DEFAULT_MATERIALS_DIR):
+    """
+    遍历目录中的配方JSON文件
+
+    参数:
+        directory: 配方目录
+
+    返回:
+        按文件名中的数字排序的文件路径迭代器
+    """
+    def sort_key(file_name):
+        stem = os.path.splitext(file_name)[0]
+        return (0, int(stem), '') if stem.isdigit() else (1, 0, stem)
+
+    file_names = [name for name in os.listdir(directory) if name.endswith('.json')]
+    for file_name in sorted(file_names, key=sort_key):
+        yield os.path.join(directory, file_name)
+
+
+def load_recipes(directory=DEFAULT_MATERIALS_DIR, decoder=None, lazy=False):
+    """
+    加载并验证目录中的所有配方
+
+    参数:
+        directory: 配方目录
+        decoder: 配方解码器，默认使用AlchemyRecipeDecoder
+        lazy: 是否延迟解码网格（返回RecipeView）
+
+    返回:
+        {文件路径: 配方数据} 字典
+    """
+    if decoder is None:
+        decoder = AlchemyRecipeDecoder()
+
+    recipes = {}
+    for file_path in iter_recipe_files(directory):
+        with PROFILER.timed("file.read"), open(file_path, 'r', encoding='utf-8') as f:
+            json_content = f.read()
+        try:
+            recipes[file_path] = decoder.decode(json_content, lazy=lazy)
+        except ValueError as e:
+            raise ValueError(f"{os.path.basename(file_path)}: {str(e)}")
+    return recipes
+
+
+def convert_recipe_file(file_path, compact=True, output_path=None):
+    """
+    在标准格式和紧凑格式之间转换配方文件
+
+    参数:
+        file_path: 配方文件路径
+        compact: True转换为紧凑格式，False转换为标准格式
+        output_path: 输出文件路径，默认覆盖原文件
+
+    返回:
+        (转换前大小, 转换后大小)，单位为字节
+    """
+    with PROFILER.timed("file.read"), open(file_path, 'r', encoding='utf-8') as f:
+        json_content = f.read()
+
+    recipe_data = AlchemyRecipeDecoder().decode(json_content)
+    converted = AlchemyRecipeEncoder().encode(recipe_data, compact=compact)
+
+    with PROFILER.timed("file.write"), open(output_path or file_path, 'w', encoding='utf-8') as f:
+        f.write(converted)
+    return len(json_content.encode('utf-8')), len(converted.encode('utf-8'))
@@ -0,0 +1,246 @@
+import copy
+import difflib
+import hashlib
+import json
+import os
+from corpus import iter_recipe_files
+from decoder import AlchemyRecipeDecoder, is_compact_recipe
+from profiler import PROFILER
+
+# 补丁文件头中的格式标识和版本
+PATCH_FORMAT = "ualchemia-patch"
+PATCH_VERSION = 1
+
+# 按元素逐个比较的列表字段，其余字段整体比较
+LIST_FIELDS = ['base_elements', 'rewards']
+
+
+def _digest(value):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _normalize(recipe_data, decoder):
+    if is_compact_recipe(recipe_data):
+        return decoder.expand_compact(recipe_data)
+    if not isinstance(recipe_data, dict) or 'id' not in recipe_data:
+        raise ValueError("快照中的配方必须是包含 'id' 的JSON对象")
+    recipe_data.pop('format', None)
+    return recipe_data
+
+
+def _iter_raw(path):
+    """
+    逐个读取快照中每个配方的原始文本
+
+    目录中每个文件、NDJSON中每一行各是一个配方；JSON数组文件无法按配方切分，
+    会先解析再序列化为规范文本。
+    """
+    if os.path.isdir(path):
+        for file_path in iter_recipe_files(path):
+            with PROFILER.timed("file.read"), open(file_path, 'r', encoding='utf-8') as f:
+                yield f.read().strip()
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+            return
+        data = json.load(f)
+
+    for recipe_data in data if isinstance(data, list) else [data]:
+        yield json.dumps(recipe_data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _raw_key(raw):
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest()
+
+
+def _parse_unmatched(path, raws, label):
+    # 解析原始文本不同的配方，返回 {配方ID: 配方数据}
+    decoder = AlchemyRecipeDecoder()
+    recipes = {}
+    for raw in raws:
+        try:
+            recipe_data = _normalize(json.loads(raw), decoder)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: 无效的JSON格式: {str(e)}")
+        recipe_id = recipe_data['id']
+        if recipe_id in recipes:
+            raise ValueError(f"{path}: {label}快照中配方ID重复: {recipe_id}")
+        recipes[recipe_id] = recipe_data
+    return recipes
+
+
+def _diff_recipe(old_data, new_data):
+    """比较同一ID的两个配方，返回字段级变更"""
+    change = {"fields": {}, "lists": {}}
+    for field in sorted(set(old_data) | set(new_data)):
+        if field in LIST_FIELDS and isinstance(old_data.get(field), list) and isinstance(new_data.get(field), list):
+            old_items = [_digest(item) for item in old_data[field]]
+            new_items = [_digest(item) for item in new_data[field]]
+            if old_items == new_items:
+                continue
+            # 按元素比较，只记录新增、删除或替换的奖励/基本炼金成分
+            matcher = difflib.SequenceMatcher(None, old_items, new_items, autojunk=False)
+            operations = []
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag != 'equal':
+                    operations.append([tag, i1, i2, new_data[field][j1:j2]])
+            change["lists"][field] = operations
+        elif field not in new_data:
+            change.setdefault("removed_fields", []).append(field)
+        elif field not in old_data or _digest(old_data[field]) != _digest(new_data[field]):
+            change["fields"][field] = new_data[field]
+    return change
+
+
+def diff_snapshots(old_path, new_path):
+    """
+    比较两个配方快照
+
+    先按原始文本的哈希流式匹配，文本完全相同的配方不需要解析；
+    只有文本不同的配方才会被解析，再按规范化内容哈希和字段比较。
+
+    参数:
+        old_path: 旧快照路径
+        new_path: 新快照路径
+
+    返回:
+        变更集字典:
+            added: 新增的配方数据列表
+            removed: 删除的配方ID列表
+            changed: 变更列表，每项包含 id、base_hash（旧哈希）、hash（新哈希）、
+                     fields（整体替换的字段）、removed_fields（删除的字段，可选）
+                     和 lists（按元素的列表变更 [操作, 起始, 结束, 新元素]）
+    """
+    with PROFILER.timed("corpus_diff.hash"):
+        old_keys = {_raw_key(raw) for raw in _iter_raw(old_path)}
+        new_keys = set()
+        new_unmatched = []
+        for raw in _iter_raw(new_path):
+            key = _raw_key(raw)
+            new_keys.add(key)
+            if key not in old_keys:
+                new_unmatched.append(raw)
+        # 第二遍读取旧快照，只保留新快照中没有的原始文本
+        old_unmatched = [raw for raw in _iter_raw(old_path) if _raw_key(raw) not in new_keys]
+
+    with PROFILER.timed("corpus_diff.fields"):
+        old_recipes = _parse_unmatched(old_path, old_unmatched, "旧")
+        new_recipes = _parse_unmatched(new_path, new_unmatched, "新")
+
+        added = [recipe_data for recipe_id, recipe_data in new_recipes.items() if recipe_id not in old_recipes]
+        removed = [recipe_id for recipe_id in old_recipes if recipe_id not in new_recipes]
+        changed = []
+        for recipe_id, new_data in new_recipes.items():
+            old_data = old_recipes.get(recipe_id)
+            if old_data is None:
+                continue
+            # 只有格式不同（缩进、紧凑格式等）的配方不算修改
+            old_hash, new_hash = _digest(old_data), _digest(new_data)
+            if old_hash == new_hash:
+                continue
+            change = _diff_recipe(old_data, new_data)
+            change.update({"id": recipe_id, "base_hash": old_hash, "hash": new_hash})
+            changed.append(change)
+
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def summarize_changeset(changeset):
+    """返回变更集的文本摘要"""
+    lines = [f"新增 {len(changeset['added'])} 个，删除 {len(changeset['removed'])} 个，修改 {len(changeset['changed'])} 个配方"]
+    for recipe_data in changeset['added']:
+        lines.append(f"+ [{recipe_data['id']}] {recipe_data.get('name', '')}")
+    for recipe_id in changeset['removed']:
+        lines.append(f"- [{recipe_id}]")
+    for change in changeset['changed']:
+        parts = list(change['fields']) + [f"-{field}" for field in change.get('removed_fields', [])]
+        for field, operations in change['lists'].items():
+            counts = {}
+            for operation in operations:
+                counts[operation[0]] = counts.get(operation[0], 0) + 1
+            parts.append(f"{field}(" + ", ".join(f"{tag} {count}" for tag, count in counts.items()) + ")")
+        lines.append(f"~ [{change['id']}] " + ", ".join(parts))
+    return "\n".join(lines)
+
+
+def write_patch(changeset, file_path):
+    """
+    将变更集写为NDJSON补丁文件，只包含变化的部分
+
+    参数:
+        changeset: diff_snapshots返回的变更集
+        file_path: 补丁文件路径
+    """
+    header = {
+        "format": PATCH_FORMAT,
+        "version": PATCH_VERSION,
+        "added": len(changeset['added']),
+        "removed": len(changeset['removed']),
+        "changed": len(changeset['changed'])
+    }
+    with PROFILER.timed("file.write"), open(file_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for recipe_data in changeset['added']:
+            f.write(json.dumps({"op": "add", "recipe": recipe_data}, ensure_ascii=False) + "\n")
+        for recipe_id in changeset['removed']:
+            f.write(json.dumps({"op": "remove", "id": recipe_id}, ensure_ascii=False) + "\n")
+        for change in changeset['changed']:
+            f.write(json.dumps(dict(change, op="change"), ensure_ascii=False) + "\n")
+
+
+def apply_patch(recipes, file_path):
+    """
+    将补丁应用到配方数据上
+
+    参数:
+        recipes: {配方ID: 配方数据} 字典，不会被修改
+        file_path: write_patch生成的补丁文件路径
+
+    返回:
+        应用补丁后的 {配方ID: 配方数据} 字典
+    """
+    result = dict(recipes)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or "null")
+        if not isinstance(header, dict) or header.get('format') != PATCH_FORMAT or header.get('version') != PATCH_VERSION:
+            raise ValueError("无效的补丁文件头")
+
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            op = entry.get('op')
+            if op == "add":
+                result[entry['recipe']['id']] = entry['recipe']
+            elif op == "remove":
+                result.pop(entry['id'], None)
+            elif op == "change":
+                recipe_id = entry['id']
+                if recipe_id not in result:
+                    raise ValueError(f"补丁要修改的配方不存在: {recipe_id}")
+                if _digest(result[recipe_id]) != entry['base_hash']:
+                    raise ValueError(f"配方 {recipe_id} 与补丁的基准版本不一致")
+
+                recipe_data = copy.deepcopy(result[recipe_id])
+                for field, value in entry['fields'].items():
+                    recipe_data[field] = value
+                for field in entry.get('removed_fields', []):
+                    recipe_data.pop(field, None)
+                for field, operations in entry['lists'].items():
+                    items = recipe_data[field]
+                    # 从后往前应用，前面操作的下标不受影响
+                    for _, start, end, new_items in reversed(operations):
+                        items[start:end] = new_items
+
+                if _digest(recipe_data) != entry['hash']:
+                    raise ValueError(f"配方 {recipe_id} 应用补丁后的结果不一致")
+                result[recipe_id] = recipe_data
+            else:
+                raise ValueError(f"未知的补丁操作: {op}")
+    return result
@@ -1,23 +1,164 @@
+import copy
+import functools
 import json
+from collections.abc import Mapping
+from types import MappingProxyType
+from encoder import COMPACT_FORMAT_VERSION, PACKED_ELEMENT_CODES, PACKED_GRID_SPACE, STANDARD_FORMAT_VERSION, pack_grid_id
+from profiler import PROFILER, profiled
+
+# 所有配方共享的网格解码缓存大小（网格编码空间不足8万个）
+GRID_MEMO_SIZE = 8192
+
+@functools.lru_cache(maxsize=GRID_MEMO_SIZE)
+def _decode_grid(encoded_id):
+    """解码网格编码，返回 (网格状态元组, 颜色)，结果由所有解码器共享缓存"""
+    # 检查是否包含颜色信息
+    color = None
+    if ":" not in encoded_id:
+        raise ValueError("缺少元素属性")
+
+    encoded_id, color_code = encoded_id.split(":")
+    color_map = {
+        "R": "火系",
+        "B": "水系",
+        "G": "草系",
+        "Y": "雷系"
+    }
+    color = color_map.get(color_code)
+    if not color:
+        raise ValueError("无效的元素属性")
+
+    # 验证编码长度
+    if len(encoded_id) != 9:
+        raise ValueError("无效的网格编码长度")
+
+    # 解码网格状态
+    grid_state = []
+    has_non_empty = False
+    for char in encoded_id:
+        try:
+            value = int(char)
+            if value not in [0, 1, 2]:
+                raise ValueError(f"无效的网格状态值: {value}")
+            if value != 0:
+                has_non_empty = True
+            grid_state.append(value)
+        except ValueError:
+            raise ValueError(f"无效的网格编码字符: {char}")
+
+    # 验证是否有非空白格子
+    if not has_non_empty:
+        raise ValueError("网格中必须至少有一个非空白格子")
+
+    return tuple(grid_state), color
+
+
+def is_compact_recipe(recipe_data):
+    """判断配方数据是否需要按紧凑格式展开（没有format字段或format为1的是标准格式）"""
+    return isinstance(recipe_data, dict) and recipe_data.get('format', STANDARD_FORMAT_VERSION) != STANDARD_FORMAT_VERSION
+
+
+def _freeze(value):
+    """将列表和字典转换为只读的元组和映射"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class RecipeView(Mapping):
+    """
+    只读配方视图
+    
+    结构字段在创建前已经验证，网格编码在第一次访问时才解码并缓存。
+    只需要id、名称、标签的工具可以完全跳过网格解码。
+    """
+    
+    def __init__(self, recipe_data):
+        self._data = recipe_data
+        self._frozen = {}
+        self._grids = {}
+    
+    def __getitem__(self, key):
+        if key not in self._frozen:
+            self._frozen[key] = _freeze(self._data[key])
+        return self._frozen[key]
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __repr__(self):
+        return f"RecipeView(id={self._data['id']!r}, name={self._data['name']!r})"
+    
+    def to_dict(self):
+        """返回配方数据的可修改副本"""
+        return copy.deepcopy(self._data)
+    
+    def _decode_grids(self, field, label):
+        if field not in self._grids:
+            grids = []
+            for i, item in enumerate(self._data[field]):
+                try:
+                    if not isinstance(item['id'], str):
+                        raise ValueError("网格编码必须是字符串")
+                    grids.append(_decode_grid(item['id']))
+                except ValueError as e:
+                    raise ValueError(f"{label} {i+1} 的网格编码无效: {str(e)}")
+            self._grids[field] = grids
+        return self._grids[field]
+    
+    def base_element_grids(self):
+        """
+        解码所有基本炼金成分的网格
+        
+        返回:
+            [(grid_state, color), ...]，grid_state为长度为9的元组
+        """
+        return self._decode_grids('base_elements', "基本炼金成分")
+    
+    def reward_grids(self):
+        """
+        解码所有奖励的网格
+        
+        返回:
+            [(grid_state, color), ...]，grid_state为长度为9的元组
+        """
+        return self._decode_grids('rewards', "奖励")
+
 
 class AlchemyRecipeDecoder:
     """炼金配方解码器，将JSON格式转换为配方数据"""
     
-    def decode(self, json_string):
+    @profiled("decoder.recipe")
+    def decode(self, json_string, lazy=False):
         """
-        将JSON字符串解码为配方数据
+        将JSON字符串解码为配方数据，自动识别标准格式和紧凑格式
         
         参数:
             json_string: JSON格式的字符串
+            lazy: 是否延迟解码网格，为True时只验证结构字段，返回只读的RecipeView
         
         返回:
-            包含配方信息的字典
+            包含配方信息的字典（总是标准格式），lazy为True时返回RecipeView
         """
         try:
-            recipe_data = json.loads(json_string)
+            with PROFILER.timed("json.loads"):
+                recipe_data = json.loads(json_string)
         except json.JSONDecodeError as e:
             raise ValueError(f"无效的JSON格式: {str(e)}")
         
+        # 紧凑格式先展开为标准格式，展开时已经验证过网格编码
+        compact = is_compact_recipe(recipe_data)
+        if compact:
+            recipe_data = self.expand_compact(recipe_data)
+        elif isinstance(recipe_data, dict):
+            # 标准格式的format字段（版本1）不属于配方数据
+            recipe_data.pop('format', None)
+        
         # 验证必要的字段
         required_fields = ['id', 'name', 'tags', 'materials', 'base_elements', 'rewards']
         for field in required_fields:
@@ -39,6 +180,8 @@ class AlchemyRecipeDecoder:
         for i, element in enumerate(recipe_data['base_elements']):
             if 'id' not in element:
                 raise ValueError(f"基本炼金成分 {i+1} 必须包含 'id'")
+            if compact or lazy:
+                continue
             
             # 验证网格编码
             try:
@@ -52,6 +195,8 @@ class AlchemyRecipeDecoder:
         for i, reward in enumerate(recipe_data['rewards']):
             if 'level' not in reward or 'property' not in reward or 'id' not in reward:
                 raise ValueError(f"奖励 {i+1} 缺少必要的字段")
+            if compact or lazy:
+                continue
             
             # 验证网格编码
             try:
@@ -61,12 +206,69 @@ class AlchemyRecipeDecoder:
             except ValueError as e:
                 raise ValueError(f"奖励 {i+1} 的网格编码无效: {str(e)}")
         
+        if lazy:
+            return RecipeView(recipe_data)
         return recipe_data
+    
+    def expand_compact(self, compact_data):
+        """
+        将紧凑格式的配方数据展开为标准格式
+        
+        参数:
+            compact_data: 紧凑格式的字典
+        
+        返回:
+            标准格式的配方字典
+        """
+        if compact_data['format'] != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"不支持的配方格式版本: {compact_data['format']}")
+        
+        required_fields = ['id', 'name', 'tags', 'materials', 'base_elements', 'rewards']
+        for field in required_fields:
+            if field not in compact_data:
+                raise ValueError(f"JSON缺少必要的字段: {field}")
+        
+        grid_decoder = RewardGridDecoder()
+        
+        if not isinstance(compact_data['base_elements'], list):
+            raise ValueError("基本炼金成分字段必须是列表")
+        
+        base_elements = []
+        for i, packed_id in enumerate(compact_data['base_elements']):
+            try:
+                base_elements.append({"id": grid_decoder.unpack(packed_id)})
+            except ValueError as e:
+                raise ValueError(f"基本炼金成分 {i+1} 的网格编码无效: {str(e)}")
+        
+        # 紧凑格式的奖励按列存储
+        columns = compact_data['rewards']
+        if not isinstance(columns, dict) or not all(isinstance(columns.get(key), list) for key in ('level', 'property', 'id')):
+            raise ValueError("紧凑格式的奖励字段必须包含 'level'、'property' 和 'id' 列表")
+        if not len(columns['level']) == len(columns['property']) == len(columns['id']):
+            raise ValueError("紧凑格式的奖励字段各列长度必须一致")
+        
+        rewards = []
+        for i, (level, property_name, packed_id) in enumerate(zip(columns['level'], columns['property'], columns['id'])):
+            try:
+                grid_id = grid_decoder.unpack(packed_id)
+            except ValueError as e:
+                raise ValueError(f"奖励 {i+1} 的网格编码无效: {str(e)}")
+            rewards.append({"level": level, "property": property_name, "id": grid_id})
+        
+        return {
+            "id": compact_data['id'],
+            "name": compact_data['name'],
+            "tags": compact_data['tags'],
+            "materials": compact_data['materials'],
+            "base_elements": base_elements,
+            "rewards": rewards
+        }
 
 
 class RewardGridDecoder:
     """奖励网格解码器，将ID字符串解码为3x3网格状态"""
     
+    @profiled("decoder.grid")
     def decode(self, encoded_id):
         """
         将ID字符串解码为3x3网格状态
@@ -77,42 +279,58 @@ class RewardGridDecoder:
         返回:
             (grid_state, color): 网格状态列表和颜色（颜色应用于非空白格子）
         """
-        # 检查是否包含颜色信息
-        color = None
-        if ":" not in encoded_id:
-            raise ValueError("缺少元素属性")
-        
-        encoded_id, color_code = encoded_id.split(":")
-        color_map = {
-            "R": "火系",
-            "B": "水系",
-            "G": "草系",
-            "Y": "雷系"
-        }
-        color = color_map.get(color_code)
-        if not color:
-            raise ValueError("无效的元素属性")
-        
-        # 验证编码长度
-        if len(encoded_id) != 9:
-            raise ValueError("无效的网格编码长度")
-        
-        # 解码网格状态
-        grid_state = []
-        has_non_empty = False
-        for char in encoded_id:
-            try:
-                value = int(char)
-                if value not in [0, 1, 2]:
-                    raise ValueError(f"无效的网格状态值: {value}")
-                if value != 0:
-                    has_non_empty = True
-                grid_state.append(value)
-            except ValueError:
-                raise ValueError(f"无效的网格编码字符: {char}")
-        
-        # 验证是否有非空白格子
-        if not has_non_empty:
-            raise ValueError("网格中必须至少有一个非空白格子")
-        
-        return grid_state, color 
\ No newline at end of file
+        if not isinstance(encoded_id, str):
+            raise ValueError("网格编码必须是字符串")
+        
+        # 相同的网格编码只解码一次
+        grid_state, color = _decode_grid(encoded_id)
+        return list(grid_state), color
+    
+    def pack(self, encoded_id):
+        """
+        验证ID字符串并转换为紧凑整数
+        
+        参数:
+            encoded_id: 编码后的ID字符串
+        
+        返回:
+            紧凑整数编码
+        """
+        self.decode(encoded_id)
+        return pack_grid_id(encoded_id)
+    
+    def unpack(self, packed_id):
+        """
+        将紧凑整数转换为ID字符串
+        
+        参数:
+            packed_id: 紧凑整数编码
+        
+        返回:
+            编码后的ID字符串
+        """
+        if not isinstance(packed_id, int) or isinstance(packed_id, bool):
+            raise ValueError("紧凑网格编码必须是整数")
+        # 网格值为0表示全部空白，同样无效
+        if not 0 <= packed_id < PACKED_GRID_SPACE * len(PACKED_ELEMENT_CODES) or packed_id % PACKED_GRID_SPACE == 0:
+            raise ValueError(f"无效的紧凑网格编码: {packed_id}")
+        
+        color_index, value = divmod(packed_id, PACKED_GRID_SPACE)
+        digits = []
+        for _ in range(9):
+            value, digit = divmod(value, 3)
+            digits.append(str(digit))
+        
+        return "".join(reversed(digits)) + ":" + PACKED_ELEMENT_CODES[color_index]
+    
+    def decode_packed(self, packed_id):
+        """
+        将紧凑整数解码为3x3网格状态
+        
+        参数:
+            packed_id: 紧凑整数编码
+        
+        返回:
+            (grid_state, color): 网格状态列表和颜色
+        """
+        return self.decode(self.unpack(packed_id))
@@ -1,14 +1,43 @@
 import json
+from profiler import PROFILER, profiled
+
+# 紧凑编码中元素属性代码的顺序
+PACKED_ELEMENT_CODES = ["R", "B", "G", "Y"]
+# 3x3网格的状态空间大小（每格三种状态）
+PACKED_GRID_SPACE = 3 ** 9
+# 标准配方格式的版本号（标准格式通常没有format字段，缺省时视为版本1）
+STANDARD_FORMAT_VERSION = 1
+# 紧凑配方格式的版本号
+COMPACT_FORMAT_VERSION = 2
+
+
+def pack_grid_id(encoded_id):
+    """
+    将ID字符串转换为紧凑整数
+    
+    参数:
+        encoded_id: 编码后的ID字符串，例如 "100000000:G"
+    
+    返回:
+        元素序号 * 3^9 + 网格状态的三进制值
+    """
+    grid_code, _, color_code = str(encoded_id).partition(":")
+    if (len(grid_code) != 9 or color_code not in PACKED_ELEMENT_CODES
+            or grid_code.strip("012") or grid_code == "000000000"):
+        raise ValueError(f"无效的网格编码: {encoded_id}")
+    return PACKED_ELEMENT_CODES.index(color_code) * PACKED_GRID_SPACE + int(grid_code, 3)
 
 class AlchemyRecipeEncoder:
     """炼金配方编码器，将配方数据转换为JSON格式"""
     
-    def encode(self, recipe_data):
+    @profiled("encoder.recipe")
+    def encode(self, recipe_data, compact=False):
         """
         将配方数据编码为JSON字符串
         
         参数:
             recipe_data: 包含配方信息的字典
+            compact: 是否使用紧凑格式（网格编码写成整数，奖励按列存储）
         
         返回:
             JSON格式的字符串
@@ -40,13 +69,56 @@ class AlchemyRecipeEncoder:
             if 'level' not in reward or 'property' not in reward or 'id' not in reward:
                 raise ValueError(f"奖励 {i+1} 缺少必要的字段")
         
+        if compact:
+            compact_data = self.to_compact(recipe_data)
+            with PROFILER.timed("json.dumps"):
+                return json.dumps(compact_data, ensure_ascii=False, separators=(',', ':'))
+        
         # 转换为JSON
-        return json.dumps(recipe_data, ensure_ascii=False, indent=2)
+        with PROFILER.timed("json.dumps"):
+            return json.dumps(recipe_data, ensure_ascii=False, indent=2)
+    
+    def to_compact(self, recipe_data):
+        """
+        将配方数据转换为紧凑格式
+        
+        参数:
+            recipe_data: 包含配方信息的字典
+        
+        返回:
+            紧凑格式的字典，base_elements为整数列表，rewards为 {'level': [...], 'property': [...], 'id': [...]}
+        """
+        base_elements = []
+        for i, element in enumerate(recipe_data['base_elements']):
+            try:
+                base_elements.append(pack_grid_id(element['id']))
+            except ValueError as e:
+                raise ValueError(f"基本炼金成分 {i+1} 的网格编码无效: {str(e)}")
+        
+        rewards = {"level": [], "property": [], "id": []}
+        for i, reward in enumerate(recipe_data['rewards']):
+            try:
+                rewards["id"].append(pack_grid_id(reward['id']))
+            except ValueError as e:
+                raise ValueError(f"奖励 {i+1} 的网格编码无效: {str(e)}")
+            rewards["level"].append(reward['level'])
+            rewards["property"].append(reward['property'])
+        
+        return {
+            "format": COMPACT_FORMAT_VERSION,
+            "id": recipe_data['id'],
+            "name": recipe_data['name'],
+            "tags": recipe_data['tags'],
+            "materials": recipe_data['materials'],
+            "base_elements": base_elements,
+            "rewards": rewards
+        }
 
 
 class RewardGridEncoder:
     """奖励网格编码器，将3x3网格状态编码为ID字符串"""
     
+    @profiled("encoder.grid")
     def encode(self, grid_state, color):
         """
         将3x3网格状态编码为ID字符串
@@ -94,4 +166,23 @@ class RewardGridEncoder:
         
         encoded_id += ":" + color_map[color]
         
-        return encoded_id 
\ No newline at end of file
+        return encoded_id 
+    
+    def encode_packed(self, grid_state, color):
+        """
+        将3x3网格状态编码为紧凑整数
+        
+        参数:
+            grid_state: 长度为9的列表，表示3x3网格的状态 (0:空白, 1:圈, 2:星)
+            color: 非空白格子（圈和星）的颜色
+        
+        返回:
+            元素序号 * 3^9 + 网格状态的三进制值
+        """
+        encoded_id = self.encode(grid_state, color)
+        
+        value = 0
+        for state in grid_state:
+            value = value * 3 + state
+        
+        return PACKED_ELEMENT_CODES.index(encoded_id[-1]) * PACKED_GRID_SPACE + value
@@ -0,0 +1,320 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# 网格状态对应的显示符号 (0:空白, 1:圈, 2:星)
+GRID_SYMBOLS = ["", "○", "★"]
+
+# 元素属性对应的显示颜色
+ELEMENT_COLORS = {
+    "火系": "#d9534f",
+    "水系": "#337ab7",
+    "草系": "#4cae4c",
+    "雷系": "#d4a017"
+}
+
+# 键盘输入对应的网格状态
+GRID_KEYS = {
+    "0": 0, "space": 0,
+    "1": 1, "o": 1,
+    "2": 2, "asterisk": 2, "s": 2
+}
+
+
+class GridEditor(tk.Canvas):
+    """用Canvas绘制的3x3网格编辑器，支持鼠标点击和键盘输入"""
+
+    def __init__(self, master, cell_size=40, **kwargs):
+        size = cell_size * 3 + 1
+        super().__init__(master, width=size, height=size, highlightthickness=1, takefocus=1, **kwargs)
+        self.cell_size = cell_size
+        self.grid_state = [0] * 9
+        self.focus_index = 0
+        self.color = ELEMENT_COLORS["火系"]
+
+        # 只创建一次画布元素，之后仅更新其属性
+        self.cells = []
+        self.symbols = []
+        for index in range(9):
+            row, col = divmod(index, 3)
+            x0, y0 = col * cell_size + 1, row * cell_size + 1
+            self.cells.append(self.create_rectangle(x0, y0, x0 + cell_size, y0 + cell_size, outline="#999999", fill="white"))
+            self.symbols.append(self.create_text(x0 + cell_size / 2, y0 + cell_size / 2, text="",
+                                                 font=('TkDefaultFont', max(cell_size // 2, 8))))
+
+        self.bind('<Button-1>', self.on_click)
+        self.bind('<Key>', self.on_key)
+        self.bind('<FocusIn>', lambda event: self.redraw())
+        self.bind('<FocusOut>', lambda event: self.redraw())
+        self.redraw()
+
+    def on_click(self, event):
+        col = min(max(event.x - 1, 0) // self.cell_size, 2)
+        row = min(max(event.y - 1, 0) // self.cell_size, 2)
+        index = row * 3 + col
+        self.focus_set()
+        self.focus_index = index
+        self.grid_state[index] = (self.grid_state[index] + 1) % 3
+        self.redraw()
+
+    def on_key(self, event):
+        key = event.keysym if event.keysym in GRID_KEYS else event.char.lower()
+        if key in GRID_KEYS:
+            # 输入状态后自动移动到下一个格子，连续输入9位即可填满网格
+            self.grid_state[self.focus_index] = GRID_KEYS[key]
+            self.focus_index = (self.focus_index + 1) % 9
+        elif event.keysym == 'Left':
+            self.focus_index = (self.focus_index - 1) % 9
+        elif event.keysym == 'Right':
+            self.focus_index = (self.focus_index + 1) % 9
+        elif event.keysym == 'Up':
+            self.focus_index = (self.focus_index - 3) % 9
+        elif event.keysym == 'Down':
+            self.focus_index = (self.focus_index + 3) % 9
+        elif event.keysym == 'BackSpace':
+            self.focus_index = (self.focus_index - 1) % 9
+            self.grid_state[self.focus_index] = 0
+        else:
+            return None
+        self.redraw()
+        return 'break'
+
+    def redraw(self):
+        has_focus = self.focus_get() is self
+        for index in range(9):
+            self.itemconfigure(self.symbols[index], text=GRID_SYMBOLS[self.grid_state[index]], fill=self.color)
+            focused = has_focus and index == self.focus_index
+            self.itemconfigure(self.cells[index], fill="#e8f0fe" if focused else "white")
+
+    def set_element(self, element):
+        self.color = ELEMENT_COLORS.get(element, "black")
+        self.redraw()
+
+    def get_state(self):
+        return list(self.grid_state)
+
+    def set_state(self, grid_state):
+        self.grid_state = list(grid_state)
+        self.redraw()
+
+    def clear(self):
+        self.grid_state = [0] * 9
+        self.focus_index = 0
+        self.redraw()
+
+
+class GridDialog:
+    """
+    可复用的网格输入对话框，基本炼金成分与奖励共用
+
+    对话框只在第一次使用时创建，关闭时隐藏而不销毁。
+    """
+
+    def __init__(self, root, title, dpi_scale, grid_encoder, grid_decoder, properties, on_add, with_reward_fields=False):
+        """
+        参数:
+            root: 主窗口
+            title: 对话框标题
+            dpi_scale: DPI缩放比例
+            grid_encoder: 网格编码器
+            grid_decoder: 网格解码器
+            properties: 可选的元素属性列表
+            on_add: 添加回调，参数为条目列表，每个条目是包含 'id'（奖励还包含 'level' 和 'property'）的字典
+            with_reward_fields: 是否显示奖励的等级和属性输入
+        """
+        self.root = root
+        self.dpi_scale = dpi_scale
+        self.grid_encoder = grid_encoder
+        self.grid_decoder = grid_decoder
+        self.properties = properties
+        self.on_add = on_add
+        self.with_reward_fields = with_reward_fields
+
+        self.dialog = tk.Toplevel(root)
+        self.dialog.title(title)
+        self.dialog.geometry(f"{int(420 * dpi_scale)}x{int((620 if with_reward_fields else 560) * dpi_scale)}")
+        self.dialog.transient(root)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.hide)
+        self.dialog.bind('<Escape>', lambda event: self.hide())
+        self.dialog.columnconfigure(1, weight=1)
+
+        row = 0
+        if with_reward_fields:
+            # 奖励等级
+            ttk.Label(self.dialog, text="等级:").grid(row=row, column=0, sticky='w', padx=5, pady=5)
+            self.level_entry = ttk.Entry(self.dialog)
+            self.level_entry.grid(row=row, column=1, sticky='ew', padx=5, pady=5)
+            row += 1
+
+            # 奖励属性（下拉菜单）
+            ttk.Label(self.dialog, text="解锁所需属性:").grid(row=row, column=0, sticky='w', padx=5, pady=5)
+            self.property_var = tk.StringVar()
+            property_combo = ttk.Combobox(self.dialog, textvariable=self.property_var, values=properties, state='readonly')
+            property_combo.grid(row=row, column=1, sticky='ew', padx=5, pady=5)
+            if properties:
+                property_combo.set(properties[0])
+            row += 1
+
+        # 3x3网格
+        ttk.Label(self.dialog, text="3x3网格 (点击切换，或输入0/1/2):").grid(row=row, column=0, columnspan=2, sticky='w', padx=5, pady=5)
+        row += 1
+        self.editor = GridEditor(self.dialog, cell_size=int(30 * dpi_scale))
+        self.editor.grid(row=row, column=0, columnspan=2, padx=5, pady=5)
+        self.editor.bind('<Return>', lambda event: self.add_single(keep_open=True))
+        row += 1
+
+        # 元素属性选择（必选）
+        ttk.Label(self.dialog, text="非空白格子元素:" if with_reward_fields else "元素:").grid(row=row, column=0, sticky='w', padx=5, pady=5)
+        self.element_var = tk.StringVar()
+        element_combo = ttk.Combobox(self.dialog, textvariable=self.element_var, values=properties, state='readonly')
+        element_combo.grid(row=row, column=1, sticky='ew', padx=5, pady=5)
+        element_combo.bind('<<ComboboxSelected>>', lambda event: self.editor.set_element(self.element_var.get()))
+        if properties:
+            element_combo.set(properties[0])
+            self.editor.set_element(properties[0])
+        row += 1
+
+        buttons_frame = ttk.Frame(self.dialog)
+        buttons_frame.grid(row=row, column=0, columnspan=2, pady=5)
+        ttk.Button(buttons_frame, text="添加并继续", command=lambda: self.add_single(keep_open=True)).pack(side='left', padx=5)
+        ttk.Button(buttons_frame, text="确认", command=lambda: self.add_single(keep_open=False)).pack(side='left', padx=5)
+        row += 1
+
+        # 批量输入：每行一个网格编码
+        bulk_frame = ttk.LabelFrame(self.dialog, text="批量输入 (每行一个 #########:E)")
+        bulk_frame.grid(row=row, column=0, columnspan=2, sticky='nsew', padx=5, pady=5)
+        self.dialog.rowconfigure(row, weight=1)
+        row += 1
+
+        if with_reward_fields:
+            ttk.Label(bulk_frame, text="可写成 \"等级 属性 编码\"，省略时使用上方的等级和属性").pack(anchor='w', padx=5)
+        self.bulk_text = tk.Text(bulk_frame, height=6, wrap='none', font=('TkDefaultFont', int(9 * dpi_scale)))
+        self.bulk_text.pack(fill='both', expand=True, padx=5, pady=5)
+        self.bulk_text.tag_configure('invalid', foreground="#d9534f")
+        self.bulk_text.bind('<<Modified>>', self.on_bulk_modified)
+
+        self.bulk_status = ttk.Label(bulk_frame, text="")
+        self.bulk_status.pack(anchor='w', padx=5)
+        ttk.Button(bulk_frame, text="批量添加", command=self.add_bulk).pack(pady=5)
+
+    def show(self):
+        self.editor.clear()
+        self.dialog.deiconify()
+        self.dialog.lift()
+        self.dialog.grab_set()
+        self.editor.focus_set()
+
+    def hide(self):
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+
+    def read_reward_fields(self):
+        try:
+            level = int(self.level_entry.get())
+        except ValueError:
+            raise ValueError("等级必须是数字")
+        property_name = self.property_var.get()
+        if not property_name:
+            raise ValueError("请选择奖励属性")
+        return level, property_name
+
+    def add_single(self, keep_open):
+        element = self.element_var.get()
+        if not element:
+            messagebox.showwarning("警告", "请选择元素", parent=self.dialog)
+            return 'break'
+
+        grid_state = self.editor.get_state()
+        if not any(grid_state):
+            messagebox.showwarning("警告", "网格中必须至少有一个非空白格子", parent=self.dialog)
+            return 'break'
+
+        grid_id = self.grid_encoder.encode(grid_state, element)
+        if self.with_reward_fields:
+            try:
+                level, property_name = self.read_reward_fields()
+            except ValueError as e:
+                messagebox.showerror("错误", str(e), parent=self.dialog)
+                return 'break'
+            entry = {"level": level, "property": property_name, "id": grid_id}
+        else:
+            entry = {"id": grid_id}
+
+        self.on_add([entry])
+
+        if keep_open:
+            self.editor.clear()
+            self.editor.focus_set()
+        else:
+            self.hide()
+        return 'break'
+
+    def parse_bulk_line(self, line):
+        """
+        解析批量输入中的一行
+
+        返回:
+            条目字典；格式无效时抛出ValueError
+        """
+        tokens = line.replace('，', ' ').replace(',', ' ').split()
+        grid_id = tokens[-1]
+        # 使用紧凑编解码器验证网格编码
+        self.grid_decoder.pack(grid_id)
+
+        if not self.with_reward_fields:
+            if len(tokens) != 1:
+                raise ValueError("每行只能包含一个网格编码")
+            return {"id": grid_id}
+
+        if len(tokens) == 1:
+            level, property_name = self.read_reward_fields()
+        elif len(tokens) == 3:
+            try:
+                level = int(tokens[0])
+            except ValueError:
+                raise ValueError("等级必须是数字")
+            property_name = tokens[1]
+            if property_name not in self.properties:
+                raise ValueError(f"无效的解锁所需属性: {property_name}")
+        else:
+            raise ValueError("格式应为 \"编码\" 或 \"等级 属性 编码\"")
+        return {"level": level, "property": property_name, "id": grid_id}
+
+    def validate_bulk(self):
+        """验证批量输入的每一行并标记无效行，返回 (有效条目列表, 错误列表)"""
+        self.bulk_text.tag_remove('invalid', '1.0', 'end')
+        entries = []
+        errors = []
+        lines = self.bulk_text.get('1.0', 'end').split('\n')
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(self.parse_bulk_line(line))
+            except ValueError as e:
+                errors.append(f"第 {line_number} 行: {str(e)}")
+                self.bulk_text.tag_add('invalid', f"{line_number}.0", f"{line_number}.end")
+
+        status = f"有效 {len(entries)} 个"
+        if errors:
+            status += f"，无效 {len(errors)} 个 ({errors[0]})"
+        self.bulk_status.configure(text=status)
+        return entries, errors
+
+    def on_bulk_modified(self, event):
+        if not self.bulk_text.edit_modified():
+            return
+        self.validate_bulk()
+        self.bulk_text.edit_modified(False)
+
+    def add_bulk(self):
+        entries, errors = self.validate_bulk()
+        if errors:
+            messagebox.showwarning("警告", "请先修正无效的行:\n" + "\n".join(errors[:10]), parent=self.dialog)
+            return
+        if not entries:
+            messagebox.showwarning("警告", "请输入至少一个网格编码", parent=self.dialog)
+            return
+
+        self.on_add(entries)
+        self.bulk_text.delete('1.0', 'end')
+        self.hide()
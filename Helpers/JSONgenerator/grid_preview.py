@@ -0,0 +1,86 @@
+import tkinter as tk
+from collections import OrderedDict
+from grid_editor import ELEMENT_COLORS
+from profiler import profiled
+
+# 预览图中空白格子和分隔线的颜色
+EMPTY_COLOR = "#f2f2f2"
+LINE_COLOR = "#999999"
+
+
+class GridPreviewCache:
+    """网格预览图缓存，按网格编码缓存渲染好的PhotoImage，超出容量时淘汰最久未使用的预览图"""
+
+    def __init__(self, master, grid_decoder, cell_size=8, maxsize=1024):
+        """
+        参数:
+            master: 预览图所属的Tk窗口
+            grid_decoder: 网格解码器
+            cell_size: 每个格子的像素大小
+            maxsize: 最多缓存的预览图数量
+        """
+        self.master = master
+        self.grid_decoder = grid_decoder
+        # 格子太小时无法区分圈和星
+        self.cell_size = max(cell_size, 6)
+        self.maxsize = maxsize
+        self._images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    def lookup(self, grid_id):
+        """
+        获取网格预览图及其元素属性
+
+        参数:
+            grid_id: 网格编码
+
+        返回:
+            (image, color): PhotoImage对象（调用方显示期间需要保留引用）和元素属性
+        """
+        entry = self._images.get(grid_id)
+        if entry is not None:
+            self._images.move_to_end(grid_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        grid_state, color = self.grid_decoder.decode(grid_id)
+        entry = (self.render(grid_state, color), color)
+        self._images[grid_id] = entry
+        if len(self._images) > self.maxsize:
+            self._images.popitem(last=False)
+        return entry
+
+    def get(self, grid_id):
+        """获取网格预览图"""
+        return self.lookup(grid_id)[0]
+
+    @profiled("gui.grid_preview.render")
+    def render(self, grid_state, color):
+        """将网格状态绘制为PhotoImage：圈绘制为空心方块，星绘制为实心方块"""
+        cell = self.cell_size
+        size = cell * 3 + 1
+        fill = ELEMENT_COLORS.get(color, "black")
+        image = tk.PhotoImage(master=self.master, width=size, height=size)
+        image.put(LINE_COLOR, to=(0, 0, size, size))
+
+        # 圈的描边宽度
+        ring = max(cell // 4, 1)
+        for index, state in enumerate(grid_state):
+            row, col = divmod(index, 3)
+            x0, y0 = col * cell + 1, row * cell + 1
+            x1, y1 = x0 + cell - 1, y0 + cell - 1
+            image.put(EMPTY_COLOR, to=(x0, y0, x1, y1))
+            if state == 1:
+                image.put(fill, to=(x0 + 1, y0 + 1, x1 - 1, y1 - 1))
+                image.put(EMPTY_COLOR, to=(x0 + 1 + ring, y0 + 1 + ring, x1 - 1 - ring, y1 - 1 - ring))
+            elif state == 2:
+                image.put(fill, to=(x0 + 1, y0 + 1, x1 - 1, y1 - 1))
+        return image
+
+    def clear(self):
+        self._images.clear()
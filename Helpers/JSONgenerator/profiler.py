@@ -0,0 +1,193 @@
+import bisect
+import functools
+import json
+import os
+import time
+
+# 设置此环境变量（非空且不为0）即可启用性能统计
+PROFILE_ENV_VAR = "UALCHEMIA_PROFILE"
+
+# 延迟直方图各个桶的上限（毫秒），最后一个桶收集更慢的操作
+HISTOGRAM_BOUNDS_MS = [0.01, 0.1, 1, 10, 100, 1000]
+
+
+class OperationStats:
+    """单个操作的调用次数、累计耗时和延迟直方图"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "min_ms": (self.min or 0.0) * 1000,
+            "max_ms": self.max * 1000,
+            "histogram": dict(zip(labels, self.histogram))
+        }
+
+
+class _Timer:
+    """计时上下文，退出时把耗时记录到性能统计器"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """未启用统计时使用的空计时上下文"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """
+    轻量级性能统计器
+
+    未启用时每次调用仍会多一层包装函数调用和一次属性检查（每次约0.1~0.2微秒）；启用后按操作名称记录调用次数、累计耗时和延迟直方图。
+    """
+
+    def __init__(self, enabled=None):
+        """
+        参数:
+            enabled: 是否启用，None表示根据环境变量UALCHEMIA_PROFILE决定
+        """
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+        self.enabled = enabled
+        self.operations = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.operations = {}
+
+    def record(self, name, seconds):
+        """
+        记录一次操作耗时
+
+        参数:
+            name: 操作名称
+            seconds: 耗时（秒）
+        """
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        stats.add(seconds)
+
+    def timed(self, name):
+        """
+        返回计时上下文，用法: with PROFILER.timed("json.loads"): ...
+
+        参数:
+            name: 操作名称
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def profiled(self, name):
+        """
+        计时装饰器
+
+        参数:
+            name: 操作名称
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def to_dict(self):
+        return {name: stats.to_dict() for name, stats in sorted(self.operations.items())}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def dump_json(self, file_path):
+        """
+        将统计结果保存为JSON文件
+
+        参数:
+            file_path: 文件路径
+        """
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def report(self):
+        """返回按累计耗时排序的文本报告"""
+        if not self.operations:
+            return "没有性能统计数据"
+
+        lines = [f"{'操作':<36}{'次数':>8}{'累计(ms)':>12}{'平均(ms)':>10}{'最大(ms)':>10}"]
+        operations = sorted(self.operations.items(), key=lambda item: item[1].total, reverse=True)
+        for name, stats in operations:
+            lines.append(f"{name:<36}{stats.count:>8}{stats.total * 1000:>12.3f}"
+                         f"{stats.total * 1000 / stats.count:>10.3f}{stats.max * 1000:>10.3f}")
+
+        lines.append("")
+        lines.append("延迟分布: " + " ".join(f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS) + f" >{HISTOGRAM_BOUNDS_MS[-1]}ms")
+        for name, stats in operations:
+            lines.append(f"{name:<36}" + " ".join(str(count) for count in stats.histogram))
+        return "\n".join(lines)
+
+    def summary(self, limit=3):
+        """返回累计耗时最多的几个操作的单行摘要，用于状态栏"""
+        operations = sorted(self.operations.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+        return " | ".join(f"{name} {stats.count}次 {stats.total * 1000:.1f}ms" for name, stats in operations)
+
+
+# 全局性能统计器
+PROFILER = Profiler()
+
+
+def profiled(name):
+    """使用全局性能统计器的计时装饰器"""
+    return PROFILER.profiled(name)
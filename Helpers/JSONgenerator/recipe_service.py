@@ -0,0 +1,346 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import time
+from corpus import DEFAULT_MATERIALS_DIR, iter_recipe_files
+from decoder import AlchemyRecipeDecoder
+from profiler import Profiler
+from search import RecipeSearchIndex
+
+# 默认监听地址
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 文件监视的轮询间隔（秒）
+DEFAULT_WATCH_INTERVAL = 1.0
+# 单行请求的长度上限（字节），超过时返回错误并丢弃该行
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class RecipeCorpusCache:
+    """常驻内存的配方库，按文件修改时间增量刷新，并维护ID索引和搜索索引"""
+
+    def __init__(self, directory=DEFAULT_MATERIALS_DIR):
+        self.directory = directory
+        self.decoder = AlchemyRecipeDecoder()
+        # 文件路径 -> (修改时间, 配方数据)
+        self.files = {}
+        # 配方ID -> 配方数据
+        self.recipes = {}
+        # 配方ID -> 使用该ID的文件路径集合（复制配方文件时会暂时出现重复ID）
+        self.paths_by_id = {}
+        # 文件路径 -> 在目录中的排序位置，重复ID时使用排在最前面的文件
+        self.file_order = {}
+        # 加载失败或ID重复的文件路径 -> (修改时间, 错误信息)
+        self.errors = {}
+        self.search_index = RecipeSearchIndex()
+
+    def refresh(self):
+        """
+        重新扫描配方目录，只重新加载新增或修改过的文件
+
+        返回:
+            发生变化的文件数量
+        """
+        seen = set()
+        changed = 0
+        changed_ids = set()
+        for order, file_path in enumerate(iter_recipe_files(self.directory)):
+            seen.add(file_path)
+            self.file_order[file_path] = order
+            try:
+                mtime = os.stat(file_path).st_mtime_ns
+            except OSError:
+                continue
+            cached = self.files.get(file_path)
+            if cached is not None and cached[0] == mtime:
+                continue
+            if file_path in self.errors and self.errors[file_path][0] == mtime:
+                continue
+
+            changed += 1
+            changed_ids.add(self._forget(file_path))
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    recipe_data = self.decoder.decode(f.read())
+            except (OSError, ValueError) as e:
+                self.errors[file_path] = (mtime, str(e))
+                continue
+            self.files[file_path] = (mtime, recipe_data)
+            self.paths_by_id.setdefault(recipe_data['id'], set()).add(file_path)
+            changed_ids.add(recipe_data['id'])
+
+        for file_path in set(self.files) | set(self.errors):
+            if file_path not in seen:
+                changed += 1
+                changed_ids.add(self._forget(file_path))
+                self.file_order.pop(file_path, None)
+
+        changed_ids.discard(None)
+        for recipe_id in changed_ids:
+            self._resolve(recipe_id)
+        return changed
+
+    def _forget(self, file_path):
+        # 移除文件的缓存，返回该文件原来的配方ID
+        self.errors.pop(file_path, None)
+        cached = self.files.pop(file_path, None)
+        if cached is None:
+            return None
+        recipe_id = cached[1]['id']
+        paths = self.paths_by_id[recipe_id]
+        paths.discard(file_path)
+        if not paths:
+            del self.paths_by_id[recipe_id]
+        return recipe_id
+
+    def _resolve(self, recipe_id):
+        # 重新确定配方ID对应的文件：重复时使用目录中排在最前面的文件，其余文件记为错误
+        paths = self.paths_by_id.get(recipe_id)
+        if not paths:
+            self.recipes.pop(recipe_id, None)
+            self.search_index.remove(recipe_id)
+            return
+
+        owner = min(paths, key=lambda file_path: self.file_order[file_path])
+        recipe_data = self.files[owner][1]
+        if self.recipes.get(recipe_id) is not recipe_data:
+            self.recipes[recipe_id] = recipe_data
+            self.search_index.add(recipe_data)
+
+        self.errors.pop(owner, None)
+        for file_path in paths - {owner}:
+            message = f"配方ID {recipe_id} 与 {os.path.basename(owner)} 重复，已忽略"
+            self.errors[file_path] = (self.files[file_path][0], message)
+
+
+class RecipeService:
+    """
+    本地配方服务
+
+    协议为按行分隔的JSON：每行一个请求 {"seq": 序号, "op": 操作, ...}，
+    服务按顺序返回 {"seq": 序号, "ok": true, "result": ...} 或 {"seq": 序号, "ok": false, "error": 错误信息}。
+    客户端可以连续发送多个请求而不等待响应（流水线）。
+    """
+
+    def __init__(self, corpus, watch_interval=DEFAULT_WATCH_INTERVAL, max_request_bytes=MAX_REQUEST_BYTES):
+        self.corpus = corpus
+        self.watch_interval = watch_interval
+        self.max_request_bytes = max_request_bytes
+        # 每个操作的延迟统计，与全局性能统计器分开
+        self.stats = Profiler(enabled=True)
+        self.handlers = {
+            "validate": self.handle_validate,
+            "decode": self.handle_decode,
+            "get": self.handle_get,
+            "batch_get": self.handle_batch_get,
+            "query": self.handle_query,
+            "stats": self.handle_stats
+        }
+
+    def handle_validate(self, request):
+        try:
+            self.corpus.decoder.decode(request['json'])
+        except (ValueError, TypeError, RecursionError) as e:
+            return {"valid": False, "error": str(e)}
+        return {"valid": True}
+
+    def handle_decode(self, request):
+        return self.corpus.decoder.decode(request['json'])
+
+    def handle_get(self, request):
+        recipe_data = self.corpus.recipes.get(request['id'])
+        if recipe_data is None:
+            raise ValueError(f"找不到配方: {request['id']}")
+        return recipe_data
+
+    def handle_batch_get(self, request):
+        return [self.corpus.recipes.get(recipe_id) for recipe_id in request['ids']]
+
+    def handle_query(self, request):
+        results = []
+        for recipe_data, field in self.corpus.search_index.search(request['text'], request.get('limit')):
+            results.append({"id": recipe_data['id'], "name": recipe_data['name'], "tags": recipe_data['tags'], "field": field})
+        return results
+
+    def handle_stats(self, request):
+        return {
+            "recipes": len(self.corpus.recipes),
+            "errors": {os.path.basename(path): error for path, (_, error) in self.corpus.errors.items()},
+            "endpoints": self.stats.to_dict()
+        }
+
+    def dispatch(self, line):
+        """
+        处理一行请求
+
+        返回:
+            响应字典
+        """
+        start = time.perf_counter()
+        seq = None
+        op = "invalid"
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("请求必须是JSON对象")
+            seq = request.get('seq')
+            handler = self.handlers.get(request.get('op'))
+            if handler is None:
+                raise ValueError(f"未知的操作: {request.get('op')}")
+            op = request['op']
+            response = {"seq": seq, "ok": True, "result": handler(request)}
+        except KeyError as e:
+            response = {"seq": seq, "ok": False, "error": f"请求缺少参数: {str(e)}"}
+        except (ValueError, TypeError) as e:
+            response = {"seq": seq, "ok": False, "error": str(e)}
+        except Exception as e:
+            # 其他异常（如嵌套过深的JSON引发的RecursionError）也只影响这一个请求，不能断开连接
+            response = {"seq": seq, "ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+        self.stats.record(op, time.perf_counter() - start)
+        return response
+
+    async def read_request(self, reader):
+        """
+        读取一行请求
+
+        返回:
+            请求行（连接关闭时为空），请求超过长度上限时丢弃整行并返回None
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+        except asyncio.LimitOverrunError as e:
+            overrun = e
+
+        # 超长的行不能留在缓冲区中，否则剩余部分会被当作下一个请求
+        while True:
+            await reader.readexactly(overrun.consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.LimitOverrunError as e:
+                overrun = e
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await self.read_request(reader)
+                if line is None:
+                    response = {"seq": None, "ok": False, "error": f"请求超过长度上限 {self.max_request_bytes} 字节"}
+                elif not line:
+                    break
+                elif not line.strip():
+                    continue
+                else:
+                    response = self.dispatch(line)
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                # 只在写缓冲超过上限时等待，流水线中已到达的请求会继续处理
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def watch(self):
+        """定期刷新配方库，使修改过的文件失效并重新加载"""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                self.corpus.refresh()
+            except OSError as e:
+                # 配方目录暂时不可用（例如被重命名）时保留已加载的配方，并在stats中报告，下次继续检查
+                self.corpus.errors[self.corpus.directory] = (None, str(e))
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        """
+        启动服务并一直运行
+
+        参数:
+            host: 监听地址（仅TCP）
+            port: 监听端口（仅TCP）
+            socket_path: UNIX套接字路径，指定时使用UNIX套接字代替TCP
+        """
+        self.corpus.refresh()
+        if socket_path:
+            # 只删除上次运行遗留的套接字，不能删除同名的普通文件
+            if os.path.exists(socket_path):
+                if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                    raise ValueError(f"{socket_path} 已存在且不是套接字")
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path, limit=self.max_request_bytes)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=self.max_request_bytes)
+
+        watcher = asyncio.ensure_future(self.watch()) if self.watch_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+class RecipeServiceClient:
+    """配方服务的同步客户端，供短时运行的脚本使用"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, timeout=10.0):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile('rb')
+        self.seq = 0
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def pipeline(self, requests):
+        """
+        一次发送多个请求，再按顺序读取所有响应
+
+        参数:
+            requests: 请求字典列表，每个字典包含 'op' 和对应参数
+
+        返回:
+            响应字典列表
+        """
+        payload = bytearray()
+        for request in requests:
+            self.seq += 1
+            payload += json.dumps(dict(request, seq=self.seq), ensure_ascii=False).encode('utf-8') + b"\n"
+        self.sock.sendall(payload)
+
+        responses = []
+        for _ in requests:
+            line = self.file.readline()
+            if not line:
+                raise ConnectionError("配方服务已断开连接")
+            responses.append(json.loads(line))
+        return responses
+
+    def request(self, op, **params):
+        """
+        发送单个请求
+
+        返回:
+            请求结果；服务返回错误时抛出ValueError
+        """
+        response = self.pipeline([dict(params, op=op)])[0]
+        if not response['ok']:
+            raise ValueError(response['error'])
+        return response['result']
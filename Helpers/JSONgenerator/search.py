@@ -0,0 +1,168 @@
+from collections import defaultdict
+
+# 字段优先级（数值越小排名越靠前）
+FIELD_PRIORITY = {
+    "name": 0,
+    "tags": 1,
+    "id": 2,
+    "materials": 3
+}
+
+# 匹配类型（数值越小排名越靠前）
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_SUBSTRING = 2
+
+
+def _normalize(text):
+    return str(text).strip().lower()
+
+
+def _grams(text):
+    """返回文本的所有单字和二元字符组"""
+    grams = set(text)
+    for i in range(len(text) - 1):
+        grams.add(text[i:i + 2])
+    return grams
+
+
+class RecipeSearchIndex:
+    """配方搜索索引，基于字符n-gram倒排表检索名称、标签、材料ID和配方ID"""
+
+    def __init__(self, recipes=None):
+        # 配方ID -> 配方数据
+        self.recipes = {}
+        # 配方ID -> [(字段, 规范化文本)]
+        self._terms = {}
+        # n-gram -> 配方ID集合
+        self._postings = defaultdict(set)
+
+        for recipe_data in recipes or []:
+            self.add(recipe_data)
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def __contains__(self, recipe_id):
+        return recipe_id in self.recipes
+
+    def add(self, recipe_data):
+        """
+        添加或就地更新一个配方
+
+        参数:
+            recipe_data: 包含配方信息的字典
+        """
+        recipe_id = recipe_data['id']
+        if recipe_id in self.recipes:
+            self.remove(recipe_id)
+
+        terms = [("name", _normalize(recipe_data.get('name', ''))), ("id", _normalize(recipe_id))]
+        terms += [("tags", _normalize(tag)) for tag in recipe_data.get('tags', [])]
+        terms += [("materials", _normalize(material['id'])) for material in recipe_data.get('materials', [])]
+        terms = [(field, text) for field, text in terms if text]
+
+        self.recipes[recipe_id] = recipe_data
+        self._terms[recipe_id] = terms
+        for _, text in terms:
+            for gram in _grams(text):
+                self._postings[gram].add(recipe_id)
+
+    def remove(self, recipe_id):
+        """
+        从索引中移除一个配方
+
+        参数:
+            recipe_id: 配方ID
+        """
+        if recipe_id not in self.recipes:
+            return
+
+        for _, text in self._terms.pop(recipe_id):
+            for gram in _grams(text):
+                postings = self._postings.get(gram)
+                if postings is None:
+                    continue
+                postings.discard(recipe_id)
+                if not postings:
+                    del self._postings[gram]
+        del self.recipes[recipe_id]
+
+    def _candidates(self, query):
+        # 单字查询直接使用单字倒排表，否则取所有二元组倒排表的交集
+        if len(query) == 1:
+            return set(self._postings.get(query, ()))
+
+        grams = [query[i:i + 2] for i in range(len(query) - 1)]
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        if not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates &= other
+            if not candidates:
+                break
+        return candidates
+
+    def _rank(self, recipe_id, query):
+        best = None
+        for field, text in self._terms[recipe_id]:
+            if text == query:
+                match = MATCH_EXACT
+            elif text.startswith(query):
+                match = MATCH_PREFIX
+            elif query in text:
+                match = MATCH_SUBSTRING
+            else:
+                continue
+            rank = (match, FIELD_PRIORITY[field])
+            if best is None or rank < best[0]:
+                best = (rank, field)
+        return best
+
+    def search(self, query, limit=None):
+        """
+        搜索配方
+
+        参数:
+            query: 查询字符串，匹配名称、标签、材料ID或配方ID的任意子串
+            limit: 最多返回的结果数量，None表示不限制
+
+        返回:
+            按相关度排序的 (配方数据, 匹配字段) 迭代器
+        """
+        query = _normalize(query)
+        if not query:
+            return
+
+        ranked = []
+        for recipe_id in self._candidates(query):
+            best = self._rank(recipe_id, query)
+            if best is not None:
+                order = (0, recipe_id, '') if isinstance(recipe_id, int) else (1, 0, str(recipe_id))
+                ranked.append((best[0], order, recipe_id, best[1]))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+
+        if limit is not None:
+            ranked = ranked[:limit]
+        for _, _, recipe_id, field in ranked:
+            yield self.recipes[recipe_id], field
+
+
+def search_recipes(recipes, query, limit=None):
+    """
+    在配方列表中搜索（一次性查询的便捷函数）
+
+    传入配方列表时每次调用都会重新建立索引，耗时与配方数量成正比；
+    需要多次查询的脚本应创建一个RecipeSearchIndex并重复使用，或直接传入该索引。
+
+    参数:
+        recipes: 配方数据列表，或已建立的RecipeSearchIndex
+        query: 查询字符串
+        limit: 最多返回的结果数量
+
+    返回:
+        按相关度排序的 (配方数据, 匹配字段) 列表
+    """
+    index = recipes if isinstance(recipes, RecipeSearchIndex) else RecipeSearchIndex(recipes)
+    return list(index.search(query, limit))
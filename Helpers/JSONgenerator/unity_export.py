@@ -0,0 +1,517 @@
+import hashlib
+import json
+import os
+import struct
+from encoder import PACKED_ELEMENT_CODES, PACKED_GRID_SPACE, pack_grid_id
+from profiler import PROFILER
+
+# 二进制配方表的文件头标识和布局版本
+TABLE_MAGIC = b"UALC"
+TABLE_LAYOUT_VERSION = 1
+
+# 元素属性的枚举值，与PACKED_ELEMENT_CODES的顺序一致（R, B, G, Y）
+ELEMENT_ENUM = {
+    "火系": 0,
+    "水系": 1,
+    "草系": 2,
+    "雷系": 3
+}
+ELEMENT_NAMES = {value: name for name, value in ELEMENT_ENUM.items()}
+
+# 材料类型的枚举值
+MATERIAL_TYPE_ENUM = {
+    "class": 0,
+    "material": 1
+}
+MATERIAL_TYPE_NAMES = {value: name for name, value in MATERIAL_TYPE_ENUM.items()}
+
+UNITY_ROOT = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'UAlchemia', 'Assets')
+)
+# 默认输出位置：二进制表放在Resources中，通过Resources.Load<TextAsset>加载
+DEFAULT_TABLE_PATH = os.path.join(UNITY_ROOT, 'Resources', 'AlchemyRecipes.bytes')
+DEFAULT_SCRIPT_PATH = os.path.join(UNITY_ROOT, 'Scripts', 'Generated', 'AlchemyRecipeTable.cs')
+
+
+def content_hash(recipes):
+    """
+    计算配方内容的哈希值
+
+    参数:
+        recipes: 配方数据列表
+
+    返回:
+        与配方顺序和JSON格式无关的SHA-256十六进制字符串，只包含二进制表能存储的字段
+    """
+    canonical = sorted(
+        json.dumps(_table_fields(recipe_data), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        for recipe_data in recipes
+    )
+    digest = hashlib.sha256(f"layout:{TABLE_LAYOUT_VERSION}\n".encode('utf-8'))
+    for line in canonical:
+        digest.update(line.encode('utf-8'))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class _StringTable:
+    """字符串驻留表，相同的名称、标签和材料ID只存储一次"""
+
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    def intern(self, text):
+        text = str(text)
+        index = self.indices.get(text)
+        if index is None:
+            index = self.indices[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+
+def _table_fields(recipe_data):
+    # 只保留二进制表能存储的字段，其余字段（如format）不参与哈希和核对
+    return {
+        "id": recipe_data['id'],
+        "name": recipe_data['name'],
+        "tags": list(recipe_data['tags']),
+        "materials": [{"type": material['type'], "id": str(material['id'])} for material in recipe_data['materials']],
+        "base_elements": [{"id": element['id']} for element in recipe_data['base_elements']],
+        "rewards": [
+            {"level": reward['level'], "property": reward['property'], "id": reward['id']}
+            for reward in recipe_data['rewards']
+        ]
+    }
+
+
+def _is_i32(value):
+    # C#端用int读取ID和等级
+    return isinstance(value, int) and not isinstance(value, bool) and -2 ** 31 <= value < 2 ** 31
+
+
+def _pack_grid(grid_id):
+    # 紧凑整数拆分为ushort网格值和元素枚举
+    element, cells = divmod(pack_grid_id(grid_id), PACKED_GRID_SPACE)
+    return cells, element
+
+
+def build_recipe_table(recipes):
+    """
+    将配方列表编码为二进制配方表
+
+    布局（小端序）:
+        4字节标识 "UALC"，u16 布局版本，32字节 内容哈希
+        u32 字符串数量，每个字符串为 u16 字节长度 + UTF-8 字节
+        u32 配方数量，每个配方为:
+            i32 ID，u16 名称字符串
+            u8 标签数量，每个标签为 u16 字符串
+            u8 材料数量，每个材料为 u8 类型 + u16 ID字符串
+            u16 基本炼金成分数量，每个为 u16 网格值 + u8 元素
+            u16 奖励数量，每个为 i32 等级 + u8 解锁所需属性 + u16 网格值 + u8 元素
+
+    参数:
+        recipes: 已验证的配方数据列表
+
+    返回:
+        二进制数据
+    """
+    # 排序前先检查ID，混合类型的ID无法排序
+    seen_ids = set()
+    for recipe_data in recipes:
+        recipe_id = recipe_data['id']
+        if not _is_i32(recipe_id):
+            raise ValueError(f"配方ID必须是32位有符号整数: {recipe_id!r}")
+        if recipe_id in seen_ids:
+            raise ValueError(f"配方ID重复: {recipe_id}")
+        seen_ids.add(recipe_id)
+
+    strings = _StringTable()
+    body = bytearray()
+    ordered = sorted((_table_fields(recipe_data) for recipe_data in recipes), key=lambda recipe_data: recipe_data['id'])
+
+    for recipe_data in ordered:
+        recipe_id = recipe_data['id']
+        if len(recipe_data['tags']) > 0xFF or len(recipe_data['materials']) > 0xFF:
+            raise ValueError(f"配方 {recipe_id} 的标签或材料过多")
+        if len(recipe_data['base_elements']) > 0xFFFF or len(recipe_data['rewards']) > 0xFFFF:
+            raise ValueError(f"配方 {recipe_id} 的基本炼金成分或奖励过多")
+
+        body += struct.pack('<iH', recipe_id, strings.intern(recipe_data['name']))
+
+        body += struct.pack('<B', len(recipe_data['tags']))
+        for tag in recipe_data['tags']:
+            body += struct.pack('<H', strings.intern(tag))
+
+        body += struct.pack('<B', len(recipe_data['materials']))
+        for material in recipe_data['materials']:
+            if material['type'] not in MATERIAL_TYPE_ENUM:
+                raise ValueError(f"配方 {recipe_id} 的材料类型无效: {material['type']}")
+            body += struct.pack('<BH', MATERIAL_TYPE_ENUM[material['type']], strings.intern(material['id']))
+
+        body += struct.pack('<H', len(recipe_data['base_elements']))
+        for element in recipe_data['base_elements']:
+            body += struct.pack('<HB', *_pack_grid(element['id']))
+
+        body += struct.pack('<H', len(recipe_data['rewards']))
+        for reward in recipe_data['rewards']:
+            if reward['property'] not in ELEMENT_ENUM:
+                raise ValueError(f"配方 {recipe_id} 的奖励属性无效: {reward['property']}")
+            if not _is_i32(reward['level']):
+                raise ValueError(f"配方 {recipe_id} 的奖励等级无效: {reward['level']!r}")
+            body += struct.pack('<iB', reward['level'], ELEMENT_ENUM[reward['property']])
+            body += struct.pack('<HB', *_pack_grid(reward['id']))
+
+    if len(strings.strings) > 0xFFFF:
+        raise ValueError("字符串数量超过65535个")
+
+    header = bytearray(TABLE_MAGIC)
+    header += struct.pack('<H', TABLE_LAYOUT_VERSION)
+    header += bytes.fromhex(content_hash(ordered))
+    header += struct.pack('<I', len(strings.strings))
+    for text in strings.strings:
+        encoded = text.encode('utf-8')
+        if len(encoded) > 0xFFFF:
+            raise ValueError(f"字符串过长: {text[:20]}...")
+        header += struct.pack('<H', len(encoded)) + encoded
+    header += struct.pack('<I', len(ordered))
+
+    return bytes(header + body)
+
+
+def read_table_hash(data):
+    """
+    读取二进制配方表中的内容哈希
+
+    返回:
+        十六进制字符串；文件头无效或布局版本不同时返回None
+    """
+    if len(data) < 38 or data[:4] != TABLE_MAGIC:
+        return None
+    if struct.unpack_from('<H', data, 4)[0] != TABLE_LAYOUT_VERSION:
+        return None
+    return data[6:38].hex()
+
+
+def read_recipe_table(data):
+    """
+    将二进制配方表解码为配方数据列表，用于验证导出结果
+
+    参数:
+        data: build_recipe_table生成的二进制数据
+
+    返回:
+        (内容哈希, 按ID排序的配方数据列表)
+    """
+    table_hash = read_table_hash(data)
+    if table_hash is None:
+        raise ValueError("无效的配方表文件头")
+
+    try:
+        offset = 38
+        (string_count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        strings = []
+        for _ in range(string_count):
+            (length,) = struct.unpack_from('<H', data, offset)
+            offset += 2
+            strings.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        def read(fmt):
+            nonlocal offset
+            values = struct.unpack_from(fmt, data, offset)
+            offset += struct.calcsize(fmt)
+            return values
+
+        def read_grid():
+            cells, element = read('<HB')
+            digits = []
+            for _ in range(9):
+                cells, digit = divmod(cells, 3)
+                digits.append(str(digit))
+            return "".join(reversed(digits)) + ":" + PACKED_ELEMENT_CODES[element]
+
+        recipes = []
+        (recipe_count,) = read('<I')
+        for _ in range(recipe_count):
+            recipe_id, name_index = read('<iH')
+            (tag_count,) = read('<B')
+            tags = [strings[read('<H')[0]] for _ in range(tag_count)]
+
+            (material_count,) = read('<B')
+            materials = []
+            for _ in range(material_count):
+                material_type, id_index = read('<BH')
+                materials.append({"type": MATERIAL_TYPE_NAMES[material_type], "id": strings[id_index]})
+
+            (element_count,) = read('<H')
+            base_elements = [{"id": read_grid()} for _ in range(element_count)]
+
+            (reward_count,) = read('<H')
+            rewards = []
+            for _ in range(reward_count):
+                level, property_enum = read('<iB')
+                rewards.append({"level": level, "property": ELEMENT_NAMES[property_enum], "id": read_grid()})
+
+            recipes.append({
+                "id": recipe_id,
+                "name": strings[name_index],
+                "tags": tags,
+                "materials": materials,
+                "base_elements": base_elements,
+                "rewards": rewards
+            })
+    except (struct.error, IndexError, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(f"配方表数据损坏: {str(e)}")
+
+    if offset != len(data):
+        raise ValueError("配方表末尾有多余的数据")
+    return table_hash, recipes
+
+
+def generate_csharp(table_hash, resource_name):
+    """
+    生成读取二进制配方表的C#脚本
+
+    参数:
+        table_hash: 配方内容哈希，写入ContentHash常量
+        resource_name: Resources中的资源名称（不含扩展名）
+
+    返回:
+        C#源代码
+    """
+    return CSHARP_TEMPLATE.replace("{{CONTENT_HASH}}", table_hash).replace("{{RESOURCE_NAME}}", resource_name)
+
+
+def export_unity_table(recipes, table_path=DEFAULT_TABLE_PATH, script_path=DEFAULT_SCRIPT_PATH, force=False):
+    """
+    导出Unity使用的二进制配方表和C#读取脚本
+
+    只有配方内容哈希变化时才重新生成，导出后会把二进制表解码回配方数据进行核对。
+
+    参数:
+        recipes: 已验证的配方数据字典列表
+        table_path: 二进制配方表路径（.bytes）
+        script_path: C#脚本路径
+        force: 是否忽略哈希强制重新生成
+
+    返回:
+        是否重新生成了文件
+    """
+    recipes = [_table_fields(recipe_data) for recipe_data in recipes]
+    new_hash = content_hash(recipes)
+
+    if not force and os.path.exists(table_path) and os.path.exists(script_path):
+        with PROFILER.timed("file.read"), open(table_path, 'rb') as f:
+            if read_table_hash(f.read(38)) == new_hash:
+                return False
+
+    with PROFILER.timed("unity_export.build"):
+        data = build_recipe_table(recipes)
+
+    # 核对导出结果能还原出原始配方
+    table_hash, decoded = read_recipe_table(data)
+    expected = sorted(recipes, key=lambda recipe_data: recipe_data['id'])
+    if table_hash != new_hash or json.dumps(decoded, sort_keys=True) != json.dumps(expected, sort_keys=True):
+        raise ValueError("配方表核对失败：解码结果与原始配方不一致")
+
+    resource_name = os.path.splitext(os.path.basename(table_path))[0]
+    for path in (table_path, script_path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    with PROFILER.timed("file.write"), open(table_path, 'wb') as f:
+        f.write(data)
+    with PROFILER.timed("file.write"), open(script_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(generate_csharp(new_hash, resource_name))
+    return True
+
+
+CSHARP_TEMPLATE = """// <auto-generated>
+// 由 Helpers/JSONgenerator/unity_export.py 生成，请勿手动修改。
+// 重新生成: python cli.py export-unity
+// </auto-generated>
+using System;
+using System.IO;
+using System.Text;
+using UnityEngine;
+
+// 元素属性，与配方JSON中的 R/B/G/Y 对应
+public enum AlchemyElement : byte
+{
+    Fire = 0,
+    Water = 1,
+    Grass = 2,
+    Thunder = 3
+}
+
+public enum AlchemyMaterialType : byte
+{
+    Class = 0,
+    Material = 1
+}
+
+// 3x3网格：Cells为9个格子的三进制值（第一个格子为最高位，0:空白, 1:圈, 2:星）
+public struct AlchemyGrid
+{
+    public ushort Cells;
+    public AlchemyElement Element;
+
+    public int GetCell(int index)
+    {
+        int value = Cells;
+        for (int i = 8; i > index; i--)
+        {
+            value /= 3;
+        }
+        return value % 3;
+    }
+}
+
+public struct AlchemyMaterial
+{
+    public AlchemyMaterialType Type;
+    public string Id;
+}
+
+public struct AlchemyReward
+{
+    public int Level;
+    public AlchemyElement Property;
+    public AlchemyGrid Grid;
+}
+
+public class AlchemyRecipe
+{
+    public int Id;
+    public string Name;
+    // 标签在字符串表中的序号，相同标签的序号相同
+    public ushort[] TagIds;
+    public AlchemyMaterial[] Materials;
+    public AlchemyGrid[] BaseElements;
+    public AlchemyReward[] Rewards;
+
+    public string GetTag(int index)
+    {
+        return AlchemyRecipeTable.Strings[TagIds[index]];
+    }
+}
+
+public static class AlchemyRecipeTable
+{
+    public const string ContentHash = "{{CONTENT_HASH}}";
+    public const string ResourceName = "{{RESOURCE_NAME}}";
+    private const int LayoutVersion = 1;
+
+    public static string[] Strings { get; private set; }
+    public static AlchemyRecipe[] Recipes { get; private set; }
+
+    // 从Resources加载配方表
+    public static void Load()
+    {
+        TextAsset asset = Resources.Load<TextAsset>(ResourceName);
+        if (asset == null)
+        {
+            throw new InvalidDataException("找不到配方表资源: " + ResourceName);
+        }
+        Load(asset.bytes);
+    }
+
+    public static void Load(byte[] data)
+    {
+        using (BinaryReader reader = new BinaryReader(new MemoryStream(data), Encoding.UTF8))
+        {
+            byte[] magic = reader.ReadBytes(4);
+            if (magic.Length != 4 || magic[0] != 'U' || magic[1] != 'A' || magic[2] != 'L' || magic[3] != 'C')
+            {
+                throw new InvalidDataException("无效的配方表文件头");
+            }
+            if (reader.ReadUInt16() != LayoutVersion)
+            {
+                throw new InvalidDataException("配方表布局版本不匹配，请重新导出");
+            }
+            reader.ReadBytes(32);
+
+            string[] strings = new string[reader.ReadUInt32()];
+            for (int i = 0; i < strings.Length; i++)
+            {
+                strings[i] = Encoding.UTF8.GetString(reader.ReadBytes(reader.ReadUInt16()));
+            }
+
+            AlchemyRecipe[] recipes = new AlchemyRecipe[reader.ReadUInt32()];
+            for (int i = 0; i < recipes.Length; i++)
+            {
+                AlchemyRecipe recipe = new AlchemyRecipe();
+                recipe.Id = reader.ReadInt32();
+                recipe.Name = strings[reader.ReadUInt16()];
+
+                recipe.TagIds = new ushort[reader.ReadByte()];
+                for (int j = 0; j < recipe.TagIds.Length; j++)
+                {
+                    recipe.TagIds[j] = reader.ReadUInt16();
+                }
+
+                recipe.Materials = new AlchemyMaterial[reader.ReadByte()];
+                for (int j = 0; j < recipe.Materials.Length; j++)
+                {
+                    recipe.Materials[j].Type = (AlchemyMaterialType)reader.ReadByte();
+                    recipe.Materials[j].Id = strings[reader.ReadUInt16()];
+                }
+
+                recipe.BaseElements = new AlchemyGrid[reader.ReadUInt16()];
+                for (int j = 0; j < recipe.BaseElements.Length; j++)
+                {
+                    recipe.BaseElements[j] = ReadGrid(reader);
+                }
+
+                recipe.Rewards = new AlchemyReward[reader.ReadUInt16()];
+                for (int j = 0; j < recipe.Rewards.Length; j++)
+                {
+                    recipe.Rewards[j].Level = reader.ReadInt32();
+                    recipe.Rewards[j].Property = (AlchemyElement)reader.ReadByte();
+                    recipe.Rewards[j].Grid = ReadGrid(reader);
+                }
+
+                recipes[i] = recipe;
+            }
+
+            Strings = strings;
+            Recipes = recipes;
+        }
+    }
+
+    // 按ID查找配方（配方按ID升序存储）
+    public static AlchemyRecipe Find(int id)
+    {
+        int low = 0;
+        int high = Recipes.Length - 1;
+        while (low <= high)
+        {
+            int middle = (low + high) / 2;
+            int current = Recipes[middle].Id;
+            if (current == id)
+            {
+                return Recipes[middle];
+            }
+            if (current < id)
+            {
+                low = middle + 1;
+            }
+            else
+            {
+                high = middle - 1;
+            }
+        }
+        return null;
+    }
+
+    private static AlchemyGrid ReadGrid(BinaryReader reader)
+    {
+        AlchemyGrid grid = new AlchemyGrid();
+        grid.Cells = reader.ReadUInt16();
+        grid.Element = (AlchemyElement)reader.ReadByte();
+        return grid;
+    }
+}
+"""